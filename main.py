@@ -7,14 +7,19 @@ import sys
 
 from src.bot.config import BOT_TOKEN
 
+_TOKEN_ERR = "\n".join((
+    "ERROR: Please provide a valid bot token!",
+    "Option 1: Set environment variable",
+    "  $env:TELEGRAM_BOT_TOKEN='your_token_here'",
+    "Option 2: Create or update a .env file with:",
+    "  TELEGRAM_BOT_TOKEN=your_token_here",
+    "",
+))
+
 
 async def main() -> None:
     if not BOT_TOKEN:
-        print("ERROR: Please provide a valid bot token!")
-        print("Option 1: Set environment variable")
-        print("  $env:TELEGRAM_BOT_TOKEN='your_token_here'")
-        print("Option 2: Create or update a .env file with:")
-        print("  TELEGRAM_BOT_TOKEN=your_token_here")
+        sys.stderr.write(_TOKEN_ERR)
         sys.exit(1)
 
     from src.bot.bot import build_bot_and_dispatcher
@@ -26,8 +31,18 @@ async def main() -> None:
         await bot.session.close()
 
 
+def _run(coro) -> None:
+    """Run *coro* on uvloop when it is installed (POSIX-only), else on asyncio."""
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(coro)
+    else:
+        uvloop.run(coro)
+
+
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        _run(main())
     except (KeyboardInterrupt, SystemExit):
-        pass
\ No newline at end of file
+        pass
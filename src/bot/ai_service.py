@@ -2,21 +2,28 @@
 AI Service – async Groq integration for natural-language → cron parsing.
 """
 
+import asyncio
 import logging
 import re
-from typing import Optional
-
-from groq import AsyncGroq
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
 from src.bot.config import GROQ_TOKEN
+from src.bot.cron import CRON_EXPR_RE
+
+if TYPE_CHECKING:
+    from groq import AsyncGroq
+
+    from src.bot.database import Database
 
 logger = logging.getLogger(__name__)
 
-_PROMPT_TEMPLATE = """Convert the following schedule description into a valid cron expression. 
+# Static instructions go in the system message so every request shares the
+# same prefix (eligible for provider-side prompt caching); only the user
+# message varies per call.
+_SYSTEM_PROMPT = """Convert the schedule description given by the user into a valid cron expression.
 If description is not clear or it's not possible to create valid cron expression, return ONLY an error message starting with "ERROR:".
 
-Text: "{text}"
-
 Return ONLY a valid cron expression in format: minute hour day month day_of_week
 
 The cron expression must:
@@ -36,45 +43,195 @@ Examples:
 
 Return ONLY the cron expression (5 fields), no explanations or markdown."""
 
+_USER_TEMPLATE = 'Text: "{text}"'
+
+# Markdown fences around an answer (```cron\n...\n``` or ```...```)
+_FENCE_RE = re.compile(r"```(?:\w*\n)?(.*?)```", flags=re.DOTALL)
+
+# Common English phrasings handled without an API call (input is pre-normalized).
+_TIME = r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)?"
+_RE_EVERY_N = re.compile(r"^every\s+(\d+\s+)?(minute|hour)s?$", flags=re.IGNORECASE)
+_RE_DAILY_AT = re.compile(rf"^(?:every\s+day|daily)\s+at\s+{_TIME}$", flags=re.IGNORECASE)
+_DAY = (
+    r"(mon(?:day)?|tue(?:s(?:day)?)?|wed(?:nesday)?|thu(?:r(?:s(?:day)?)?)?"
+    r"|fri(?:day)?|sat(?:urday)?|sun(?:day)?)"
+)
+_RE_WEEKDAY_AT = re.compile(rf"^every\s+{_DAY}\s+at\s+{_TIME}$", flags=re.IGNORECASE)
+
+
+def _to_hour_minute(hour: str, minute: Optional[str], meridiem: Optional[str]) -> Optional[Tuple[int, int]]:
+    h, m = int(hour), int(minute or 0)
+    if meridiem:
+        if not 1 <= h <= 12:
+            return None
+        h = h % 12 + (12 if meridiem.lower() == "pm" else 0)
+    if h > 23 or m > 59:
+        return None
+    return h, m
+
+
+def _parse_locally(text: str) -> Optional[str]:
+    """Translate a handful of unambiguous phrases to cron, or return None."""
+    match = _RE_EVERY_N.match(text)
+    if match:
+        step = int(match.group(1) or 1)
+        unit = match.group(2).lower()
+        if unit == "minute" and 1 <= step <= 59:
+            return "* * * * *" if step == 1 else f"*/{step} * * * *"
+        if unit == "hour" and 1 <= step <= 23:
+            return "0 * * * *" if step == 1 else f"0 */{step} * * *"
+        return None
+
+    match = _RE_DAILY_AT.match(text)
+    if match:
+        hm = _to_hour_minute(*match.groups())
+        return f"{hm[1]} {hm[0]} * * *" if hm else None
+
+    match = _RE_WEEKDAY_AT.match(text)
+    if match:
+        hm = _to_hour_minute(*match.groups()[1:])
+        return f"{hm[1]} {hm[0]} * * {match.group(1)[:3].upper()}" if hm else None
+
+    return None
+
 
 class AIService:
     """Async wrapper around the Groq chat-completions API."""
 
-    def __init__(self, api_key: Optional[str] = None):
-        self.client = AsyncGroq(api_key=api_key or GROQ_TOKEN)
+    # Maximum number of distinct schedule phrases whose cron result is kept.
+    CACHE_SIZE: int = 1024
+
+    def __init__(self, api_key: Optional[str] = None, db: Optional["Database"] = None):
+        """
+        Args:
+            api_key: Groq API key; defaults to GROQ_API_KEY.
+            db: optional database used to persist parsed phrases across restarts.
+        """
+        self._api_key = api_key or GROQ_TOKEN
+        self._client: Optional["AsyncGroq"] = None
+        self.db = db
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._inflight: "Dict[str, asyncio.Future[str]]" = {}
+
+    @property
+    def client(self) -> "AsyncGroq":
+        """Groq client, created on first use so startup does not import groq."""
+        if self._client is None:
+            import httpx
+            from groq import AsyncGroq, DefaultAsyncHttpxClient
+
+            # One long-lived, keep-alive connection pool for every Groq request.
+            self._client = AsyncGroq(
+                api_key=self._api_key,
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=120),
+                ),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the underlying HTTP connection pool, if it was ever opened."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
 
     async def parse_schedule_to_cron(self, schedule_text: str) -> str:
         """
         Send *schedule_text* to Groq and return a 5-field cron expression.
 
+        Input that is already cron-shaped, or matches one of a few common
+        English phrasings, is answered without an API call, and
+        results for previously seen phrases are served from an in-memory LRU
+        backed by the database (when one is attached).
+
         Raises:
-            ValueError: on API error or when AI cannot parse the text.
+            ValueError: when AI cannot parse the text (deterministic; the
+                rejection is remembered so the phrase is not re-sent).
+            RuntimeError: when the Groq request itself fails (transient).
         """
-        prompt = _PROMPT_TEMPLATE.format(text=schedule_text)
+        normalized = " ".join(schedule_text.split())
+        if CRON_EXPR_RE.fullmatch(normalized):
+            return normalized
+
+        local = _parse_locally(normalized)
+        if local is not None:
+            return local
+
+        key = normalized.lower()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            if not CRON_EXPR_RE.fullmatch(cached):
+                raise ValueError(cached)
+            return cached
+
+        if self.db is not None:
+            cached = await self.db.get_cached_cron(key)
+            if cached is not None:
+                self._remember(key, cached)
+                return cached
+
+        # Identical phrases arriving while one is being resolved share its result.
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._resolve(key, normalized))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _resolve(self, key: str, normalized: str) -> str:
+        try:
+            cron_expression = await self._complete(normalized)
+        except ValueError as e:
+            # The model rejected the phrase; asking again would get the same answer.
+            self._remember(key, str(e))
+            raise
+        # Only well-formed answers are worth remembering; anything else will be
+        # rejected by the scheduler and should be re-asked next time.
+        if CRON_EXPR_RE.fullmatch(cron_expression):
+            self._remember(key, cron_expression)
+            if self.db is not None:
+                await self.db.save_cached_cron(key, cron_expression)
+        return cron_expression
+
+    def _remember(self, key: str, cron_expression: str) -> None:
+        self._cache[key] = cron_expression
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    async def _complete(self, schedule_text: str) -> str:
+        """Ask Groq for the cron expression of *schedule_text* (uncached).
+
+        Each phrase gets its own request: a shared prompt would let one user's
+        text steer the answer for another's.
+        """
+        return self._clean_answer(await self._chat(_SYSTEM_PROMPT, _USER_TEMPLATE.format(text=schedule_text), 100))
+
+    @staticmethod
+    def _clean_answer(content: str) -> str:
+        cron_expression = content.strip()
+        if cron_expression[:6].upper() == "ERROR:":
+            raise ValueError(cron_expression)
 
+        fence_match = _FENCE_RE.search(cron_expression)
+        return fence_match.group(1).strip() if fence_match else cron_expression
+
+    async def _chat(self, system: str, user: str, max_tokens: int) -> str:
         try:
             completion = await self.client.chat.completions.create(
                 model="llama-3.3-70b-versatile",
-                messages=[{"role": "user", "content": prompt}],
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": user},
+                ],
                 temperature=0.1,
-                max_tokens=100,
+                max_tokens=max_tokens,
             )
-
-            cron_expression = completion.choices[0].message.content.strip()
-
-            if cron_expression.upper().startswith("ERROR:"):
-                raise ValueError(cron_expression)
-
-            # Strip potential markdown fences (```cron\n...\n``` or ```...```)
-            fence_match = re.search(r"```(?:\w*\n)?(.*?)```", cron_expression, flags=re.DOTALL)
-            if fence_match:
-                cron_expression = fence_match.group(1).strip()
-
-            return cron_expression
-
-        except ValueError:
-            raise
+            content = completion.choices[0].message.content
         except Exception as e:
             logger.error("Failed to parse schedule with AI: %s", e)
-            raise ValueError(f"Failed to parse schedule: {e}") from e
-
+            raise RuntimeError(f"Failed to parse schedule: {e}") from e
+        if not isinstance(content, str):
+            logger.error("AI returned no text: %r", content)
+            raise RuntimeError("Failed to parse schedule: empty AI reply")
+        return content
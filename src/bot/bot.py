@@ -2,21 +2,31 @@
 Bot & Dispatcher setup, startup / shutdown lifecycle.
 """
 
+import asyncio
 import logging
+from typing import Optional
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
-from aiogram.fsm.storage.memory import MemoryStorage
-from aiogram.types import BotCommand
 
 from src.bot.database import Database
 from src.bot.translation_service import TranslationService
 from src.bot.scheduler_service import SchedulerService
 from src.bot.ai_service import AIService
+from src.bot.storage import BoundedMemoryStorage
+from src.bot.instance_lock import InstanceLock
 from src.bot.handlers import router as handlers_router
 from src.bot.callbacks import router as callbacks_router
-from src.bot.config import BOT_TOKEN, WARSAW_TZ
+from src.bot.helpers import drain_background_tasks, sync_bot_commands
+from src.bot.config import (
+    BOT_TOKEN,
+    FSM_MAX_STATES,
+    FSM_STATE_TTL,
+    SCHEDULER_LOCK_PATH,
+    SCHEDULER_SYNC_INTERVAL,
+    WARSAW_TZ,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -34,13 +44,14 @@ def build_bot_and_dispatcher():
         logger.info("Sending scheduled message to %s", chat_id)
         await bot.send_message(chat_id, message)
 
-    dp = Dispatcher(storage=MemoryStorage())
+    dp = Dispatcher(storage=BoundedMemoryStorage(max_size=FSM_MAX_STATES, ttl=FSM_STATE_TTL))
 
     # --- Services ---
     db = Database()
     translator = TranslationService()
-    ai_service = AIService()
+    ai_service = AIService(db=db)
     scheduler = SchedulerService(callback_func=send_scheduled_message)
+    scheduler_lock = InstanceLock(SCHEDULER_LOCK_PATH)
 
     dp["db"] = db
     dp["translator"] = translator
@@ -52,46 +63,64 @@ def build_bot_and_dispatcher():
     dp.include_router(callbacks_router)
 
     # --- Lifecycle hooks ---
+    async def _lead_or_sync() -> None:
+        """Take the scheduler lock if it is free, or re-sync jobs if we hold it.
+
+        Followers only write to the database, so the leader re-reads it to pick
+        up schedules created, edited, paused or deleted elsewhere.
+        """
+        if scheduler.running:
+            added, removed, failed = await scheduler.sync(db.get_active_schedules, WARSAW_TZ.key)
+            if added or removed or failed:
+                logger.info("Synced schedules: %d loaded, %d removed, %d failed.", added, removed, failed)
+        elif scheduler_lock.acquire():
+            scheduler.start()
+            added, _removed, failed = await scheduler.sync(db.get_active_schedules, WARSAW_TZ.key)
+            logger.info("Holding %s; restored %d active schedules (%d failed).", SCHEDULER_LOCK_PATH, added, failed)
+
+    async def _scheduler_leader_loop() -> None:
+        while True:
+            await asyncio.sleep(SCHEDULER_SYNC_INTERVAL)
+            try:
+                await _lead_or_sync()
+            except Exception as e:
+                logger.error("Scheduler sync failed: %s", e)
+
+    leader_task: Optional[asyncio.Task] = None
+
     @dp.startup()
     async def on_startup() -> None:
+        nonlocal leader_task
         logger.info("Bot starting up…")
         await db.init()
 
-        # Set menu commands for every available language
-        for lang in translator.available_languages():
-            commands = [
-                BotCommand(command="start", description=translator.get_message("cmd_start", lang)),
-                BotCommand(command="help", description=translator.get_message("cmd_help", lang)),
-                BotCommand(command="schedule", description=translator.get_message("cmd_schedule", lang)),
-                BotCommand(command="list", description=translator.get_message("cmd_list", lang)),
-                BotCommand(command="manage", description=translator.get_message("cmd_manage", lang)),
-                BotCommand(command="timezone", description=translator.get_message("cmd_timezone", lang)),
-            ]
-            await bot.set_my_commands(commands, language_code=lang)
-
-        # Restore persisted schedules
-        all_schedules = await db.get_schedules()
-        logger.info("Loading %d schedules from database…", len(all_schedules))
-        for s in all_schedules:
-            if not s["is_paused"]:
-                try:
-                    scheduler.add_job(
-                        s["job_id"],
-                        s["chat_id"],
-                        s["message"],
-                        s["schedule_data"]["expression"],
-                        timezone=WARSAW_TZ.zone,
-                    )
-                except Exception as e:
-                    logger.error("Failed to restore job %s: %s", s["job_id"], e)
-
-        scheduler.start()
+        # Set menu commands for every available language (one concurrent round-trip)
+        await asyncio.gather(
+            *(sync_bot_commands(bot, translator, lang) for lang in translator.available_languages())
+        )
+
+        try:
+            await _lead_or_sync()
+        except Exception as e:
+            # The leader loop below retries on its next tick.
+            logger.error("Scheduler sync failed: %s", e)
+        if not scheduler.running:
+            logger.warning(
+                "Another instance holds %s; this one will fire scheduled jobs only if it takes over.",
+                SCHEDULER_LOCK_PATH,
+            )
+        leader_task = asyncio.create_task(_scheduler_leader_loop())
         logger.info("Bot is ready.")
 
     @dp.shutdown()
     async def on_shutdown() -> None:
         logger.info("Bot shutting down…")
+        if leader_task is not None:
+            leader_task.cancel()
         scheduler.shutdown()
+        scheduler_lock.release()
+        await drain_background_tasks()
+        await ai_service.close()
 
     return bot, dp
 
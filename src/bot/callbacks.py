@@ -2,20 +2,37 @@
 Callback-query handlers (aiogram Router).
 """
 
+import asyncio
 import logging
 
 from aiogram import Bot, Router, F
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
-from aiogram.types import BotCommand, CallbackQuery, InlineKeyboardMarkup
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup
 
 from src.bot.states import ScheduleWizard, EditWizard
 from src.bot.database import Database
 from src.bot.translation_service import TranslationService
 from src.bot.scheduler_service import SchedulerService
-from src.bot.helpers import get_lang, build_help_text, build_list_text, build_job_text, validate_chat_id
+from src.bot.helpers import (
+    get_lang,
+    build_help_text,
+    build_list_text,
+    build_job_text,
+    validate_chat_id,
+    build_manage_view,
+    sync_bot_commands,
+    build_schedule_step3_text,
+    build_schedule_step1_text,
+    build_start_text,
+    build_chat_unreachable_text,
+    run_in_background,
+    build_confirm_delete_text,
+    build_deleted_text,
+)
 from src.bot.config import WARSAW_TZ
-from aiogram.utils.markdown import hbold, hcode, hitalic
+from aiogram.utils.markdown import hbold, hitalic
 from src.bot import keyboards as kb
 
 logger = logging.getLogger(__name__)
@@ -28,11 +45,7 @@ router = Router(name="callbacks")
 # ------------------------------------------------------------------
 
 async def _get_job(db: Database, job_id: str, user_id: int):
-    jobs = await db.get_schedules(user_id)
-    for j in jobs:
-        if j["job_id"] == job_id:
-            return j
-    return None
+    return await db.get_schedule(job_id, user_id)
 
 
 # ------------------------------------------------------------------
@@ -47,26 +60,27 @@ async def cb_language(
     translator: TranslationService,
     **_,
 ):
-    new_lang = cq.data.split(":")[1]
-
-    commands = [
-        BotCommand(command="start", description=translator.get_message("cmd_start", new_lang)),
-        BotCommand(command="help", description=translator.get_message("cmd_help", new_lang)),
-        BotCommand(command="schedule", description=translator.get_message("cmd_schedule", new_lang)),
-        BotCommand(command="list", description=translator.get_message("cmd_list", new_lang)),
-        BotCommand(command="manage", description=translator.get_message("cmd_manage", new_lang)),
-    ]
-    await bot.set_my_commands(commands, language_code=new_lang)
-    await db.set_user_language(cq.from_user.id, new_lang)
+    new_lang = cq.data.partition(":")[2]
+    if not new_lang:
+        await cq.answer()
+        return
 
+    # Stop the button spinner first; the menu update is not needed for the reply
     msg = translator.get_message("msg_callback_lang_changed", new_lang)
     await cq.answer(f"{msg}{new_lang.upper()}")
 
-    # Refresh /start view
-    chat_id = cq.message.chat.id
-    title = translator.get_message("msg_start_title", new_lang)
-    desc = translator.get_message("msg_start_description", new_lang)
-    await bot.send_message(chat_id, f"{title}\n\n{desc}", reply_markup=kb.start_keyboard(translator, new_lang))
+    await db.set_user_language(cq.from_user.id, new_lang)
+    run_in_background(sync_bot_commands(bot, translator, new_lang))
+
+    # Refresh the /start view in place; the language buttons only appear on it
+    text = build_start_text(translator, new_lang)
+    markup = kb.start_keyboard(translator, new_lang)
+    try:
+        await cq.message.edit_text(text, reply_markup=markup)
+    except TelegramBadRequest as e:
+        # Re-picking the current language leaves the view unchanged
+        if "message is not modified" not in str(e):
+            await bot.send_message(cq.message.chat.id, text, reply_markup=markup)
 
 
 # ------------------------------------------------------------------
@@ -100,23 +114,18 @@ async def cb_saved_contacts(
     await cq.answer()
     contacts = await db.get_recent_chat_ids(cq.from_user.id)
 
-    # Filter out unreachable contacts
-    reachable = []
-    for c in contacts:
-        if await validate_chat_id(bot, str(c)):
-            reachable.append(c)
+    # Filter out unreachable contacts (checked concurrently; the list holds at most a few ids)
+    checks = await asyncio.gather(*(validate_chat_id(bot, str(c)) for c in contacts))
+    reachable = [c for c, ok in zip(contacts, checks) if ok]
 
     if not reachable:
         await cq.message.answer(translator.get_message("msg_no_saved_contacts", lang))
         # Re-present step 1 without the saved contacts button
-        title = translator.get_message("msg_schedule_title", lang)
-        step1 = translator.get_message("msg_schedule_step1", lang)
-        hint = translator.get_message("msg_schedule_step1_hint", lang)
         markup = kb.schedule_step1_keyboard(translator, lang, has_recent_contacts=False)
-        await cq.message.answer(f"{title}\n\n{step1}\n{hint}", reply_markup=markup)
+        await cq.message.answer(build_schedule_step1_text(translator, lang), reply_markup=markup)
         return
     msg = translator.get_message("msg_select_saved_contact", lang)
-    await cq.message.answer(msg, reply_markup=kb.saved_contacts_keyboard(translator, lang, reachable))
+    await cq.message.answer(msg, reply_markup=kb.saved_contacts_keyboard(translator, lang, tuple(reachable)))
 
 
 @router.callback_query(F.data.startswith("schedule:select_contact:"))
@@ -130,22 +139,19 @@ async def cb_select_contact(
 ):
     lang = await get_lang(db, cq.from_user.id)
     try:
-        contact_id = int(cq.data.split(":")[2])
-    except (ValueError, IndexError):
+        contact_id = int(cq.data.rpartition(":")[2])
+    except ValueError:
         await cq.answer()
         return
 
     if not await validate_chat_id(bot, str(contact_id)):
         await cq.answer()
-        msg = translator.get_message("msg_chat_unreachable", lang).replace("{chat_id}", str(contact_id))
+        msg = build_chat_unreachable_text(str(contact_id), translator, lang)
         await cq.message.answer(msg)
         # Re-present step 1
-        title = translator.get_message("msg_schedule_title", lang)
-        step1 = translator.get_message("msg_schedule_step1", lang)
-        hint = translator.get_message("msg_schedule_step1_hint", lang)
-        recent = await db.get_recent_chat_ids(cq.from_user.id)
-        markup = kb.schedule_step1_keyboard(translator, lang, has_recent_contacts=bool(recent))
-        await cq.message.answer(f"{title}\n\n{step1}\n{hint}", reply_markup=markup)
+        has_recent = await db.has_recent_chat_ids(cq.from_user.id)
+        markup = kb.schedule_step1_keyboard(translator, lang, has_recent_contacts=has_recent)
+        await cq.message.answer(build_schedule_step1_text(translator, lang), reply_markup=markup)
         return
 
     await state.update_data(chat_id=str(contact_id))
@@ -158,6 +164,58 @@ async def cb_select_contact(
 # Main-menu navigation   cmd:schedule / cmd:list / cmd:manage / cmd:help
 # ------------------------------------------------------------------
 
+async def _cmd_schedule(bot: Bot, state: FSMContext, db: Database, translator: TranslationService,
+                        chat_id: int, user_id: int, lang: str) -> None:
+    await state.set_state(ScheduleWizard.waiting_chat_id)
+    has_recent = await db.has_recent_chat_ids(user_id)
+    markup = kb.schedule_step1_keyboard(translator, lang, has_recent_contacts=has_recent)
+    await bot.send_message(chat_id, build_schedule_step1_text(translator, lang), reply_markup=markup)
+
+
+async def _cmd_list(bot: Bot, state: FSMContext, db: Database, translator: TranslationService,
+                    chat_id: int, user_id: int, lang: str) -> None:
+    schedules = await db.get_schedules(user_id)
+    if not schedules:
+        await bot.send_message(chat_id, translator.get_message("msg_no_active_schedules", lang))
+        return
+    await bot.send_message(chat_id, build_list_text(schedules, translator, lang), reply_markup=kb.manage_button(translator, lang))
+
+
+async def _cmd_manage(bot: Bot, state: FSMContext, db: Database, translator: TranslationService,
+                      chat_id: int, user_id: int, lang: str) -> None:
+    schedules = await db.get_schedules(user_id)
+    if not schedules:
+        await bot.send_message(chat_id, translator.get_message("msg_no_schedules_manage", lang))
+        return
+    for text, markup in build_manage_view(schedules, translator, lang):
+        await bot.send_message(chat_id, text, reply_markup=markup)
+
+
+async def _cmd_help(bot: Bot, state: FSMContext, db: Database, translator: TranslationService,
+                    chat_id: int, user_id: int, lang: str) -> None:
+    await bot.send_message(chat_id, build_help_text(translator, lang), reply_markup=kb.help_keyboard(translator, lang))
+
+
+async def _cmd_timezone(bot: Bot, state: FSMContext, db: Database, translator: TranslationService,
+                        chat_id: int, user_id: int, lang: str) -> None:
+    title = translator.get_message("msg_timezone_title", lang)
+    instruction = translator.get_message("msg_timezone_instruction", lang)
+    await bot.send_message(
+        chat_id,
+        f"{title}\n\n{instruction}",
+        reply_markup=kb.timezone_keyboard(translator, lang)
+    )
+
+
+_CMD_HANDLERS = {
+    "schedule": _cmd_schedule,
+    "list": _cmd_list,
+    "manage": _cmd_manage,
+    "help": _cmd_help,
+    "timezone": _cmd_timezone,
+}
+
+
 @router.callback_query(F.data.startswith("cmd:"))
 async def cb_cmd(
     cq: CallbackQuery,
@@ -167,55 +225,88 @@ async def cb_cmd(
     translator: TranslationService,
     **_,
 ):
-    cmd = cq.data.split(":")[1]
+    cmd = cq.data.partition(":")[2]
     await cq.answer()
 
-    chat_id = cq.message.chat.id
+    handler = _CMD_HANDLERS.get(cmd)
+    if handler is None:
+        return
+
     user_id = cq.from_user.id
     lang = await get_lang(db, user_id)
-
-    if cmd == "schedule":
-        await state.set_state(ScheduleWizard.waiting_chat_id)
-        title = translator.get_message("msg_schedule_title", lang)
-        step1 = translator.get_message("msg_schedule_step1", lang)
-        hint = translator.get_message("msg_schedule_step1_hint", lang)
-        recent = await db.get_recent_chat_ids(user_id)
-        markup = kb.schedule_step1_keyboard(translator, lang, has_recent_contacts=bool(recent))
-        await bot.send_message(chat_id, f"{title}\n\n{step1}\n{hint}", reply_markup=markup)
-
-    elif cmd == "list":
-        schedules = await db.get_schedules(user_id)
-        if not schedules:
-            await bot.send_message(chat_id, translator.get_message("msg_no_active_schedules", lang))
-            return
-        await bot.send_message(chat_id, build_list_text(schedules, translator, lang), reply_markup=kb.manage_button(translator, lang))
-
-    elif cmd == "manage":
-        schedules = await db.get_schedules(user_id)
-        if not schedules:
-            await bot.send_message(chat_id, translator.get_message("msg_no_schedules_manage", lang))
-            return
-        for job in schedules:
-            await bot.send_message(chat_id, build_job_text(job, translator, lang),
-                                   reply_markup=kb.job_manage_keyboard(translator, lang, job["job_id"], job["is_paused"]))
-
-    elif cmd == "help":
-        await bot.send_message(chat_id, build_help_text(translator, lang), reply_markup=kb.help_keyboard(translator, lang))
-
-    elif cmd == "timezone":
-        title = translator.get_message("msg_timezone_title", lang)
-        instruction = translator.get_message("msg_timezone_instruction", lang)
-        await bot.send_message(
-            chat_id,
-            f"{title}\n\n{instruction}",
-            reply_markup=kb.timezone_keyboard(translator, lang)
-        )
+    await handler(bot, state, db, translator, cq.message.chat.id, user_id, lang)
 
 
 # ------------------------------------------------------------------
 # Manage actions   manage:pause:<id> / manage:resume:<id> / manage:delete:<id>
 # ------------------------------------------------------------------
 
+async def _manage_pause(cq: CallbackQuery, db: Database, translator: TranslationService,
+                        scheduler: SchedulerService, state: FSMContext, job: dict, lang: str) -> None:
+    job_id = job["job_id"]
+    if scheduler.pause_job(job_id):
+        await db.update_schedule_pause_status(job_id, True)
+        job["is_paused"] = True
+        await asyncio.gather(
+            cq.message.edit_text(
+                build_job_text(job, translator, lang),
+                reply_markup=kb.job_manage_keyboard(translator, lang, job_id, True),
+            ),
+            cq.answer(translator.get_message("msg_callback_paused", lang)),
+        )
+    else:
+        await cq.answer(translator.get_message("msg_callback_pause_error", lang), show_alert=True)
+
+
+async def _manage_resume(cq: CallbackQuery, db: Database, translator: TranslationService,
+                         scheduler: SchedulerService, state: FSMContext, job: dict, lang: str) -> None:
+    job_id = job["job_id"]
+    sd = job["schedule_data"]
+    if scheduler.resume_job(job_id, sd["expression"], job["chat_id"], job["message"], timezone=WARSAW_TZ.key):
+        await db.update_schedule_pause_status(job_id, False)
+        job["is_paused"] = False
+        await asyncio.gather(
+            cq.message.edit_text(
+                build_job_text(job, translator, lang),
+                reply_markup=kb.job_manage_keyboard(translator, lang, job_id, False),
+            ),
+            cq.answer(translator.get_message("msg_callback_resumed", lang)),
+        )
+    else:
+        await cq.answer(translator.get_message("msg_callback_resume_error", lang), show_alert=True)
+
+
+async def _manage_delete(cq: CallbackQuery, db: Database, translator: TranslationService,
+                         scheduler: SchedulerService, state: FSMContext, job: dict, lang: str) -> None:
+    job_id = job["job_id"]
+    await asyncio.gather(
+        cq.message.edit_text(
+            build_confirm_delete_text(job, translator, lang),
+            reply_markup=kb.confirm_delete_keyboard(translator, lang, job_id),
+        ),
+        cq.answer(),
+    )
+
+
+async def _manage_edit(cq: CallbackQuery, db: Database, translator: TranslationService,
+                       scheduler: SchedulerService, state: FSMContext, job: dict, lang: str) -> None:
+    job_id = job["job_id"]
+    await state.set_state(EditWizard.waiting_message)
+    await state.set_data({"job_id": job_id, "original_job": job})
+    await cq.answer()
+    msg = translator.get_message("msg_edit_step1", lang)
+    current_msg = job["message"]
+    await cq.message.answer(f"{msg}\n\n<b>Current message:</b>\n{hitalic(current_msg)}", reply_markup=kb.edit_message_keyboard(translator, lang, job_id))
+
+
+_MANAGE_ACTIONS = {
+    "pause": _manage_pause,
+    "resume": _manage_resume,
+    "delete": _manage_delete,
+    "edit": _manage_edit,
+}
+
+
 @router.callback_query(F.data.startswith("manage:"))
 async def cb_manage_action(
     cq: CallbackQuery,
@@ -225,12 +316,12 @@ async def cb_manage_action(
     state: FSMContext,
     **_,
 ):
-    parts = cq.data.split(":")
-    if len(parts) != 3:
+    sub, _sep, job_id = cq.data.partition(":")[2].partition(":")
+    action = _MANAGE_ACTIONS.get(sub) if job_id else None
+    if action is None:
         await cq.answer()
         return
 
-    subaction, job_id = parts[1], parts[2]
     user_id = cq.from_user.id
     lang = await get_lang(db, user_id)
 
@@ -239,47 +330,7 @@ async def cb_manage_action(
         await cq.answer(translator.get_message("msg_callback_not_found", lang), show_alert=True)
         return
 
-    if subaction == "pause":
-        if scheduler.pause_job(job_id):
-            await db.update_schedule_pause_status(job_id, True)
-            job["is_paused"] = True
-            await cq.message.edit_text(
-                build_job_text(job, translator, lang),
-                reply_markup=kb.job_manage_keyboard(translator, lang, job_id, True),
-            )
-            await cq.answer(translator.get_message("msg_callback_paused", lang))
-        else:
-            await cq.answer(translator.get_message("msg_callback_pause_error", lang), show_alert=True)
-
-    elif subaction == "resume":
-        sd = job["schedule_data"]
-        if scheduler.resume_job(job_id, sd["expression"], job["chat_id"], job["message"], timezone=WARSAW_TZ.zone):
-            await db.update_schedule_pause_status(job_id, False)
-            job["is_paused"] = False
-            await cq.message.edit_text(
-                build_job_text(job, translator, lang),
-                reply_markup=kb.job_manage_keyboard(translator, lang, job_id, False),
-            )
-            await cq.answer(translator.get_message("msg_callback_resumed", lang))
-        else:
-            await cq.answer(translator.get_message("msg_callback_resume_error", lang), show_alert=True)
-
-    elif subaction == "delete":
-        confirm_prefix = translator.get_message("msg_confirm_delete", lang)
-        confirm_text = f"{confirm_prefix}{hcode(job_id)}\n\n" + build_job_text(job, translator, lang)
-        await cq.message.edit_text(
-            confirm_text,
-            reply_markup=kb.confirm_delete_keyboard(translator, lang, job_id),
-        )
-        await cq.answer()
-
-    elif subaction == "edit":
-        await state.set_state(EditWizard.waiting_message)
-        await state.update_data(job_id=job_id, original_job=job)
-        await cq.answer()
-        msg = translator.get_message("msg_edit_step1", lang)
-        current_msg = job["message"]
-        await cq.message.answer(f"{msg}\n\n<b>Current message:</b>\n{hitalic(current_msg)}", reply_markup=kb.edit_message_keyboard(translator, lang, job_id))
+    await action(cq, db, translator, scheduler, state, job, lang)
 
 
 # ------------------------------------------------------------------
@@ -294,7 +345,10 @@ async def cb_cancel_edit(
     state: FSMContext,
     **_,
 ):
-    job_id = cq.data.split(":")[1]
+    job_id = cq.data.partition(":")[2]
+    if not job_id:
+        await cq.answer()
+        return
     user_id = cq.from_user.id
     lang = await get_lang(db, user_id)
 
@@ -304,11 +358,13 @@ async def cb_cancel_edit(
         return
 
     await state.clear()
-    await cq.message.edit_text(
-        build_job_text(job, translator, lang),
-        reply_markup=kb.job_manage_keyboard(translator, lang, job_id, job["is_paused"]),
+    await asyncio.gather(
+        cq.message.edit_text(
+            build_job_text(job, translator, lang),
+            reply_markup=kb.job_manage_keyboard(translator, lang, job_id, job["is_paused"]),
+        ),
+        cq.answer(translator.get_message("msg_callback_cancelled", lang)),
     )
-    await cq.answer(translator.get_message("msg_callback_cancelled", lang))
 
 
 @router.callback_query(F.data.startswith("edit_keep:"), StateFilter(EditWizard.waiting_message))
@@ -319,8 +375,7 @@ async def cb_edit_keep_message(
     state: FSMContext,
     **_,
 ):
-    parts = cq.data.split(":")
-    if len(parts) != 2:
+    if not cq.data.partition(":")[2]:
         await cq.answer()
         return
 
@@ -338,19 +393,7 @@ async def cb_edit_keep_message(
 
     await cq.answer()
     
-    keys = [
-        "msg_schedule_step3_title", "msg_schedule_examples",
-        "msg_help_daily", "msg_help_every_minutes", "msg_help_every_hours",
-        "msg_help_cron_monday", "msg_schedule_step3_hint",
-    ]
-    m = {k: translator.get_message(k, lang) for k in keys}
-    text = (
-        f"{m['msg_schedule_step3_title']}\n\n"
-        f"{m['msg_schedule_examples']}\n"
-        f"{m['msg_help_daily']}\n{m['msg_help_every_minutes']}\n"
-        f"{m['msg_help_every_hours']}\n{m['msg_help_cron_monday']}\n\n"
-        f"{m['msg_schedule_step3_hint']}"
-    )
+    text = build_schedule_step3_text(translator, lang)
     await cq.message.answer(text)
 
 
@@ -363,12 +406,11 @@ async def cb_edit_keep_message(
 @router.callback_query(F.data.startswith("set_tz:"))
 async def cb_set_tz(cq: CallbackQuery, translator: TranslationService, db: Database, **_):
     """Handle timezone selection. Since we use global timezone, just show acknowledgement."""
-    parts = cq.data.split(":")
-    if len(parts) != 2:
+    tz_name = cq.data.partition(":")[2]
+    if not tz_name:
         await cq.answer()
         return
 
-    tz_name = parts[1]
     lang = await get_lang(db, cq.from_user.id)
     
     # Show that the timezone selection was received
@@ -392,19 +434,27 @@ async def cb_confirm_delete(
     scheduler: SchedulerService,
     **_,
 ):
-    job_id = cq.data.split(":")[1]
-    lang = await get_lang(db, cq.from_user.id)
+    job_id = cq.data.partition(":")[2]
+    if not job_id:
+        await cq.answer()
+        return
+    user_id = cq.from_user.id
+    lang = await get_lang(db, user_id)
+
+    if not await _get_job(db, job_id, user_id):
+        await cq.answer(translator.get_message("msg_callback_not_found", lang), show_alert=True)
+        return
 
     scheduler.delete_job(job_id)
     await db.delete_schedule(job_id)
 
-    await cq.answer(translator.get_message("msg_callback_deleted", lang))
-
-    lbl_id = translator.get_message("msg_job_id", lang)
-    lbl_st = translator.get_message("msg_job_status", lang)
-    deleted_status = translator.get_message("msg_list_status_deleted", lang)
-    text = f"{lbl_id}{job_id}`\n{lbl_st}{deleted_status}\n"
-    await cq.message.edit_text(text, reply_markup=InlineKeyboardMarkup(inline_keyboard=[]))
+    await asyncio.gather(
+        cq.answer(translator.get_message("msg_callback_deleted", lang)),
+        cq.message.edit_text(
+            build_deleted_text(job_id, translator, lang),
+            reply_markup=InlineKeyboardMarkup(inline_keyboard=[]),
+        ),
+    )
 
 
 @router.callback_query(F.data.startswith("cancel_delete:"))
@@ -414,7 +464,10 @@ async def cb_cancel_delete(
     translator: TranslationService,
     **_,
 ):
-    job_id = cq.data.split(":")[1]
+    job_id = cq.data.partition(":")[2]
+    if not job_id:
+        await cq.answer()
+        return
     user_id = cq.from_user.id
     lang = await get_lang(db, user_id)
 
@@ -423,9 +476,11 @@ async def cb_cancel_delete(
         await cq.answer()
         return
 
-    await cq.message.edit_text(
-        build_job_text(job, translator, lang),
-        reply_markup=kb.job_manage_keyboard(translator, lang, job_id, job["is_paused"]),
+    await asyncio.gather(
+        cq.message.edit_text(
+            build_job_text(job, translator, lang),
+            reply_markup=kb.job_manage_keyboard(translator, lang, job_id, job["is_paused"]),
+        ),
+        cq.answer(translator.get_message("msg_callback_cancelled", lang)),
     )
-    await cq.answer(translator.get_message("msg_callback_cancelled", lang))
 
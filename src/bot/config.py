@@ -5,22 +5,35 @@ Loads environment variables and defines constants.
 
 import os
 import logging
+from zoneinfo import ZoneInfo
 
-import pytz
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # Timezone
-WARSAW_TZ = pytz.timezone("Europe/Warsaw")
+WARSAW_TZ = ZoneInfo("Europe/Warsaw")
 
 # Tokens
 BOT_TOKEN: str = os.getenv("TELEGRAM_BOT_TOKEN", "")
 GROQ_TOKEN: str | None = os.getenv("GROQ_API_KEY")
 
+# FSM storage: idle wizard state is dropped after FSM_STATE_TTL seconds
+FSM_STATE_TTL: float = float(os.getenv("FSM_STATE_TTL", "1800"))
+FSM_MAX_STATES: int = int(os.getenv("FSM_MAX_STATES", "10000"))
+
+# Scheduler: late fires within the grace window still run; missed runs are coalesced
+SCHEDULER_MISFIRE_GRACE_TIME: int = int(os.getenv("SCHEDULER_MISFIRE_GRACE_TIME", "300"))
+SCHEDULER_MAX_INSTANCES: int = int(os.getenv("SCHEDULER_MAX_INSTANCES", "1"))
+
 # Database
 DB_PATH: str = os.getenv("SCHEDULES_DB_PATH", "schedules.db")
 
+# Only the process holding this lock fires scheduled jobs (see instance_lock.py)
+SCHEDULER_LOCK_PATH: str = os.getenv("SCHEDULER_LOCK_PATH", f"{DB_PATH}.lock")
+# Seconds between lock retries (followers) and database re-syncs (the leader)
+SCHEDULER_SYNC_INTERVAL: float = float(os.getenv("SCHEDULER_SYNC_INTERVAL", "30"))
+
 # Logging
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_LEVEL_STR = os.getenv("LOG_LEVEL", "INFO")
@@ -30,5 +43,24 @@ try:
 except AttributeError:
     LOG_LEVEL = logging.INFO
 
-logging.basicConfig(format=LOG_FORMAT, level=LOG_LEVEL)
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Thread/process names are not in LOG_FORMAT; don't gather them for every record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# Leave logging alone if the host application already configured it
+_root_logger = logging.getLogger()
+if not _root_logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+    _root_logger.addHandler(_handler)
+    _root_logger.setLevel(LOG_LEVEL)
+
+# APScheduler logs every job add and every run at INFO; keep it to warnings by default
+APSCHEDULER_LOG_LEVEL_STR = os.getenv("APSCHEDULER_LOG_LEVEL", "WARNING")
+logging.getLogger("apscheduler").setLevel(
+    getattr(logging, APSCHEDULER_LOG_LEVEL_STR.upper(), logging.WARNING)
+)
 
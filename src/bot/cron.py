@@ -0,0 +1,17 @@
+"""
+Cron expression grammar shared by the scheduler and the AI parser.
+"""
+
+import re
+
+_CRON_NAME = r"(?:SUN|MON|TUE|WED|THU|FRI|SAT|JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)"
+_CRON_ATOM = rf"(?:\d+|{_CRON_NAME})"
+_CRON_RANGE = rf"{_CRON_ATOM}(?:-{_CRON_ATOM})?"
+_CRON_ITEM = rf"(?:\*|{_CRON_RANGE})(?:/\d+)?"
+# A well-formed field: a list of wildcards, values and ranges, each with an
+# optional step ("*", "*/5", "1,3,5", "MON-FRI,SUN", "0-23/2").
+_CRON_FIELD = rf"{_CRON_ITEM}(?:,{_CRON_ITEM})*"
+
+CRON_FIELD_RE = re.compile(_CRON_FIELD, flags=re.IGNORECASE)
+# A whole well-formed expression: five such fields separated by whitespace.
+CRON_EXPR_RE = re.compile(rf"\s*{_CRON_FIELD}(?:\s+{_CRON_FIELD}){{4}}\s*", flags=re.IGNORECASE)
@@ -2,23 +2,42 @@
 Async SQLite database service.
 """
 
-import json
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import aiosqlite
 
 from src.bot.config import DB_PATH
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib
+    import json
+
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+else:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
 logger = logging.getLogger(__name__)
 
 
 class Database:
     """Async SQLite database for schedules and user preferences."""
 
+    # Seconds a user's language stays cached before it is re-read from disk.
+    LANG_CACHE_TTL: float = 300.0
+    # Cached users kept before expired entries are swept (or the cache reset).
+    LANG_CACHE_MAX: int = 10_000
+
     def __init__(self, db_path: str = DB_PATH):
         self.db_path = db_path
+        self._lang_cache: Dict[int, Tuple[Optional[str], float]] = {}
 
     # ------------------------------------------------------------------
     # Lifecycle
@@ -44,6 +63,9 @@ class Database:
                 )
                 """
             )
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_schedules_user_id ON schedules (user_id)"
+            )
             await db.execute(
                 """
                 CREATE TABLE IF NOT EXISTS users (
@@ -54,6 +76,15 @@ class Database:
                 )
                 """
             )
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ai_cron_cache (
+                    phrase TEXT PRIMARY KEY,
+                    expression TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
             await db.commit()
 
         await self._migrate()
@@ -77,6 +108,11 @@ class Database:
                 "updated_at": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
                 "recent_chat_ids": "TEXT DEFAULT '[]'",
             },
+            "ai_cron_cache": {
+                "phrase": "TEXT PRIMARY KEY",
+                "expression": "TEXT NOT NULL",
+                "created_at": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+            },
         }
         try:
             async with aiosqlite.connect(self.db_path) as db:
@@ -136,7 +172,7 @@ class Database:
             (job_id, user_id, chat_id, message, schedule_data, is_paused)
             VALUES (?, ?, ?, ?, ?, ?)
             """,
-            (job_id, user_id, str(chat_id), message, json.dumps(schedule_data), int(is_paused)),
+            (job_id, user_id, str(chat_id), message, _json_dumps(schedule_data), int(is_paused)),
         )
         logger.info("Schedule saved: %s", job_id)
 
@@ -163,47 +199,71 @@ class Database:
             SET message = ?, schedule_data = ?
             WHERE job_id = ?
             """,
-            (message, json.dumps(schedule_data), job_id),
+            (message, _json_dumps(schedule_data), job_id),
         )
         logger.info("Schedule %s updated", job_id)
 
+    _SCHEDULE_COLUMNS = "job_id, user_id, chat_id, message, schedule_data, is_paused, created_at"
+
+    @staticmethod
+    def _schedule_from_row(row: tuple) -> Dict:
+        return {
+            "job_id": row[0],
+            "user_id": row[1],
+            "chat_id": row[2],
+            "message": row[3],
+            "schedule_data": _json_loads(row[4]),
+            "is_paused": bool(row[5]),
+            "created_at": row[6],
+        }
+
     async def get_schedules(self, user_id: Optional[int] = None) -> List[Dict]:
-        query = "SELECT job_id, user_id, chat_id, message, schedule_data, is_paused, created_at FROM schedules"
+        query = f"SELECT {self._SCHEDULE_COLUMNS} FROM schedules"
         params = ()
         if user_id is not None:
             query += " WHERE user_id = ?"
             params = (user_id,)
         
         rows = await self._execute(query, params, fetch_all=True)
+        return [self._schedule_from_row(row) for row in rows or ()]
 
-        schedules: List[Dict] = []
-        if rows:
-            for row in rows:
-                schedules.append(
-                    {
-                        "job_id": row[0],
-                        "user_id": row[1],
-                        "chat_id": row[2],
-                        "message": row[3],
-                        "schedule_data": json.loads(row[4]),
-                        "is_paused": bool(row[5]),
-                        "created_at": row[6],
-                    }
-                )
-        return schedules
+    async def get_active_schedules(self) -> List[Dict]:
+        """Fetch every unpaused schedule in one query (used to restore jobs at startup)."""
+        rows = await self._execute(
+            f"SELECT {self._SCHEDULE_COLUMNS} FROM schedules WHERE is_paused = 0",
+            fetch_all=True,
+        )
+        return [self._schedule_from_row(row) for row in rows or ()]
+
+    async def get_schedule(self, job_id: str, user_id: Optional[int] = None) -> Optional[Dict]:
+        """Fetch a single schedule by primary key, optionally scoped to *user_id*."""
+        query = f"SELECT {self._SCHEDULE_COLUMNS} FROM schedules WHERE job_id = ?"
+        params: tuple = (job_id,)
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params = (job_id, user_id)
+
+        row = await self._execute(query, params, fetch_one=True)
+        return self._schedule_from_row(row) if row else None
 
     # ------------------------------------------------------------------
     # User preferences
     # ------------------------------------------------------------------
 
     async def get_user_language(self, user_id: int, default: str = "ru") -> str:
+        now = time.monotonic()
+        cached = self._lang_cache.get(user_id)
+        if cached is not None and now - cached[1] < self.LANG_CACHE_TTL:
+            return cached[0] or default
+
         row = await self._execute(
             "SELECT language FROM users WHERE user_id = ?",
             (user_id,),
             fetch_one=True,
         )
-        return row[0] if row and row[0] else default
-
+        language = row[0] if row and row[0] else None
+        self._cache_language(user_id, language, now)
+        return language or default
 
     async def set_user_language(self, user_id: int, language: str) -> None:
         await self._execute(
@@ -213,29 +273,44 @@ class Database:
             """,
             (user_id, language),
         )
+        self._cache_language(user_id, language, time.monotonic())
+
+    def _cache_language(self, user_id: int, language: Optional[str], now: float) -> None:
+        cache = self._lang_cache
+        if user_id not in cache and len(cache) >= self.LANG_CACHE_MAX:
+            cutoff = now - self.LANG_CACHE_TTL
+            self._lang_cache = cache = {uid: v for uid, v in cache.items() if v[1] > cutoff}
+            if len(cache) >= self.LANG_CACHE_MAX:
+                cache.clear()
+        cache[user_id] = (language, now)
 
     async def add_recent_chat_id(
         self, user_id: int, chat_id: int, max_items: int = 5
     ) -> None:
         try:
-            row = await self._execute(
-                "SELECT recent_chat_ids FROM users WHERE user_id = ?",
-                (user_id,),
-                fetch_one=True,
-            )
-            recent: list = json.loads(row[0]) if row and row[0] else []
-            if chat_id in recent:
-                recent.remove(chat_id)
-            recent.insert(0, chat_id)
-            recent = recent[:max_items]
+            # Read-modify-write in one connection and one write transaction,
+            # so concurrent updates for the same user cannot interleave.
+            async with aiosqlite.connect(self.db_path) as db:
+                await db.execute("BEGIN IMMEDIATE")
+                cursor = await db.execute(
+                    "SELECT recent_chat_ids FROM users WHERE user_id = ?",
+                    (user_id,),
+                )
+                row = await cursor.fetchone()
+                recent: list = _json_loads(row[0]) if row and row[0] else []
+                if chat_id in recent:
+                    recent.remove(chat_id)
+                recent.insert(0, chat_id)
+                recent = recent[:max_items]
 
-            await self._execute(
-                """
-                INSERT INTO users (user_id, recent_chat_ids) VALUES (?, ?)
-                ON CONFLICT(user_id) DO UPDATE SET recent_chat_ids = excluded.recent_chat_ids
-                """,
-                (user_id, json.dumps(recent)),
-            )
+                await db.execute(
+                    """
+                    INSERT INTO users (user_id, recent_chat_ids) VALUES (?, ?)
+                    ON CONFLICT(user_id) DO UPDATE SET recent_chat_ids = excluded.recent_chat_ids
+                    """,
+                    (user_id, _json_dumps(recent)),
+                )
+                await db.commit()
         except Exception as e:
             logger.error("Error adding recent chat_id: %s", e)
 
@@ -247,8 +322,45 @@ class Database:
                 fetch_one=True,
             )
             if row and row[0]:
-                return json.loads(row[0])
+                return _json_loads(row[0])
         except Exception as e:
             logger.error("Error getting recent chat_ids: %s", e)
         return []
 
+    async def has_recent_chat_ids(self, user_id: int) -> bool:
+        """Cheap existence check used to decide whether to offer saved contacts."""
+        try:
+            row = await self._execute(
+                "SELECT 1 FROM users WHERE user_id = ? AND recent_chat_ids NOT IN ('', '[]') LIMIT 1",
+                (user_id,),
+                fetch_one=True,
+            )
+            return row is not None
+        except Exception as e:
+            logger.error("Error checking recent chat_ids: %s", e)
+            return False
+
+    # ------------------------------------------------------------------
+    # AI parse cache
+    # ------------------------------------------------------------------
+
+    async def get_cached_cron(self, phrase: str) -> Optional[str]:
+        try:
+            row = await self._execute(
+                "SELECT expression FROM ai_cron_cache WHERE phrase = ?",
+                (phrase,),
+                fetch_one=True,
+            )
+            return row[0] if row else None
+        except Exception as e:
+            logger.error("Error reading AI cron cache: %s", e)
+            return None
+
+    async def save_cached_cron(self, phrase: str, expression: str) -> None:
+        try:
+            await self._execute(
+                "INSERT OR REPLACE INTO ai_cron_cache (phrase, expression) VALUES (?, ?)",
+                (phrase, expression),
+            )
+        except Exception as e:
+            logger.error("Error writing AI cron cache: %s", e)
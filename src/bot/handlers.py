@@ -3,7 +3,7 @@ Command & text-message handlers (aiogram Router).
 """
 
 import logging
-from datetime import datetime
+import time
 
 from aiogram import Bot, Router, F
 from aiogram.filters import Command, StateFilter
@@ -17,7 +17,19 @@ from src.bot.translation_service import TranslationService
 from src.bot.scheduler_service import SchedulerService
 from src.bot.ai_service import AIService
 from src.bot.config import WARSAW_TZ
-from src.bot.helpers import get_lang, build_help_text, build_list_text, build_job_text, validate_chat_id
+from src.bot.helpers import (
+    get_lang,
+    build_help_text,
+    build_list_text,
+    validate_chat_id,
+    describe_error,
+    build_manage_view,
+    run_in_background,
+    build_schedule_step3_text,
+    build_schedule_step1_text,
+    build_start_text,
+    build_chat_unreachable_text,
+)
 from src.bot import keyboards as kb
 
 logger = logging.getLogger(__name__)
@@ -25,6 +37,35 @@ logger = logging.getLogger(__name__)
 router = Router(name="handlers")
 
 
+# ------------------------------------------------------------------
+# Reply templates
+# ------------------------------------------------------------------
+
+_SUCCESS_TEMPLATE = "{title}\n\n{id_label}{job_id}\n{schedule_label}{schedule}\n{target_label}{target}\n"
+_ERROR_TEMPLATE = "{title}{error}\n\n{retry}\n{restart}"
+
+
+def _success_text(translator: TranslationService, lang: str, title_key: str, job_id: str, schedule: str, target: str) -> str:
+    return _SUCCESS_TEMPLATE.format_map({
+        "title": translator.get_message(title_key, lang),
+        "id_label": translator.get_message("msg_success_id", lang),
+        "job_id": hcode(job_id),
+        "schedule_label": translator.get_message("msg_success_schedule", lang),
+        "schedule": hcode(schedule),
+        "target_label": translator.get_message("msg_success_target", lang),
+        "target": hcode(target),
+    })
+
+
+def _error_text(translator: TranslationService, lang: str, title_key: str, exc: Exception) -> str:
+    return _ERROR_TEMPLATE.format_map({
+        "title": translator.get_message(title_key, lang),
+        "error": describe_error(exc, translator, lang),
+        "retry": translator.get_message("msg_error_retry", lang),
+        "restart": translator.get_message("msg_error_restart", lang),
+    })
+
+
 # ------------------------------------------------------------------
 # /start
 # ------------------------------------------------------------------
@@ -32,9 +73,7 @@ router = Router(name="handlers")
 @router.message(Command("start"))
 async def cmd_start(message: Message, db: Database, translator: TranslationService, **_):
     lang = await get_lang(db, message.from_user.id)
-    title = translator.get_message("msg_start_title", lang)
-    desc = translator.get_message("msg_start_description", lang)
-    await message.answer(f"{title}\n\n{desc}", reply_markup=kb.start_keyboard(translator, lang))
+    await message.answer(build_start_text(translator, lang), reply_markup=kb.start_keyboard(translator, lang))
 
 
 # ------------------------------------------------------------------
@@ -56,14 +95,10 @@ async def cmd_schedule(message: Message, state: FSMContext, db: Database, transl
     lang = await get_lang(db, message.from_user.id)
     await state.set_state(ScheduleWizard.waiting_chat_id)
 
-    title = translator.get_message("msg_schedule_title", lang)
-    step1 = translator.get_message("msg_schedule_step1", lang)
-    hint = translator.get_message("msg_schedule_step1_hint", lang)
+    has_recent = await db.has_recent_chat_ids(message.from_user.id)
+    markup = kb.schedule_step1_keyboard(translator, lang, has_recent_contacts=has_recent)
 
-    recent = await db.get_recent_chat_ids(message.from_user.id)
-    markup = kb.schedule_step1_keyboard(translator, lang, has_recent_contacts=bool(recent))
-
-    await message.answer(f"{title}\n\n{step1}\n{hint}", reply_markup=markup)
+    await message.answer(build_schedule_step1_text(translator, lang), reply_markup=markup)
 
 
 # ------------------------------------------------------------------
@@ -95,9 +130,7 @@ async def cmd_manage(message: Message, db: Database, translator: TranslationServ
         await message.answer(translator.get_message("msg_no_schedules_manage", lang))
         return
 
-    for job in schedules:
-        text = build_job_text(job, translator, lang)
-        markup = kb.job_manage_keyboard(translator, lang, job["job_id"], job["is_paused"])
+    for text, markup in build_manage_view(schedules, translator, lang):
         await message.answer(text, reply_markup=markup)
 
 
@@ -112,15 +145,17 @@ async def wizard_chat_id(message: Message, bot: Bot, state: FSMContext, db: Data
 
     # Validate the bot can reach this chat
     if not await validate_chat_id(bot, target):
-        msg = translator.get_message("msg_chat_unreachable", lang).replace("{chat_id}", target)
+        msg = build_chat_unreachable_text(target, translator, lang)
         await message.answer(msg)
         return  # Stay in waiting_chat_id state so user can retry
 
+    # Remembering the contact is a disk write the user need not wait for
     try:
-        if str(target).lstrip("-").isdigit():
-            await db.add_recent_chat_id(message.from_user.id, int(target))
-    except Exception as e:
-        logger.warning("Could not save recent chat_id: %s", e)
+        numeric_id = int(target)
+    except ValueError:
+        pass  # @username targets are not kept as recent contacts
+    else:
+        run_in_background(db.add_recent_chat_id(message.from_user.id, numeric_id))
 
     await state.update_data(chat_id=target)
     await state.set_state(ScheduleWizard.waiting_message)
@@ -133,19 +168,7 @@ async def wizard_message(message: Message, state: FSMContext, db: Database, tran
     await state.update_data(message_text=message.text)
     await state.set_state(ScheduleWizard.waiting_schedule)
 
-    keys = [
-        "msg_schedule_step3_title", "msg_schedule_examples",
-        "msg_help_daily", "msg_help_every_minutes", "msg_help_every_hours",
-        "msg_help_cron_monday", "msg_schedule_step3_hint",
-    ]
-    m = {k: translator.get_message(k, lang) for k in keys}
-    text = (
-        f"{m['msg_schedule_step3_title']}\n\n"
-        f"{m['msg_schedule_examples']}\n"
-        f"{m['msg_help_daily']}\n{m['msg_help_every_minutes']}\n"
-        f"{m['msg_help_every_hours']}\n{m['msg_help_cron_monday']}\n\n"
-        f"{m['msg_schedule_step3_hint']}"
-    )
+    text = build_schedule_step3_text(translator, lang)
     await message.answer(text)
 
 
@@ -162,12 +185,12 @@ async def wizard_schedule(
     lang = await get_lang(db, message.from_user.id)
     data = await state.get_data()
     user_id = message.from_user.id
-    job_id = f"job_{user_id}_{int(datetime.now().timestamp())}"
+    job_id = f"job_{user_id}_{time.time_ns()}"
 
     try:
         cron_expr = await ai_service.parse_schedule_to_cron(message.text.strip())
         schedule_data = scheduler.add_job(
-            job_id, data["chat_id"], data["message_text"], cron_expr, timezone=WARSAW_TZ.zone
+            job_id, data["chat_id"], data["message_text"], cron_expr, timezone=WARSAW_TZ.key
         )
 
         await db.save_schedule(
@@ -179,28 +202,13 @@ async def wizard_schedule(
             is_paused=False,
         )
 
-        mk = {k: translator.get_message(k, lang) for k in [
-            "msg_success_created", "msg_success_id", "msg_success_schedule", "msg_success_target",
-        ]}
-        text = (
-            f"{mk['msg_success_created']}\n\n"
-            f"{mk['msg_success_id']}{hcode(job_id)}\n"
-            f"{mk['msg_success_schedule']}{hcode(schedule_data['description'])}\n"
-            f"{mk['msg_success_target']}{hcode(data['chat_id'])}\n"
-        )
+        text = _success_text(translator, lang, "msg_success_created", job_id, schedule_data["description"], data["chat_id"])
         await message.answer(text, reply_markup=kb.success_keyboard(translator, lang, job_id))
         await state.clear()
 
     except Exception as e:
         logger.error("Error creating schedule: %s", e)
-        mk = {k: translator.get_message(k, lang) for k in [
-            "msg_error_create", "msg_error_retry", "msg_error_restart",
-        ]}
-        error_text = (
-            f"{mk['msg_error_create']}{e}\n\n"
-            f"{mk['msg_error_retry']}\n"
-            f"{mk['msg_error_restart']}"
-        )
+        error_text = _error_text(translator, lang, "msg_error_create", e)
         await message.answer(error_text, reply_markup=kb.restart_button(translator, lang))
 
 
@@ -235,19 +243,7 @@ async def edit_message(
     await state.update_data(message_text=message.text)
     await state.set_state(EditWizard.waiting_schedule)
 
-    keys = [
-        "msg_schedule_step3_title", "msg_schedule_examples",
-        "msg_help_daily", "msg_help_every_minutes", "msg_help_every_hours",
-        "msg_help_cron_monday", "msg_schedule_step3_hint",
-    ]
-    m = {k: translator.get_message(k, lang) for k in keys}
-    text = (
-        f"{m['msg_schedule_step3_title']}\n\n"
-        f"{m['msg_schedule_examples']}\n"
-        f"{m['msg_help_daily']}\n{m['msg_help_every_minutes']}\n"
-        f"{m['msg_help_every_hours']}\n{m['msg_help_cron_monday']}\n\n"
-        f"{m['msg_schedule_step3_hint']}"
-    )
+    text = build_schedule_step3_text(translator, lang)
     await message.answer(text)
 
 
@@ -278,7 +274,7 @@ async def edit_schedule(
             original_job["chat_id"],
             data["message_text"],
             cron_expr,
-            timezone=WARSAW_TZ.zone
+            timezone=WARSAW_TZ.key
         )
 
         await db.update_schedule(
@@ -287,27 +283,12 @@ async def edit_schedule(
             schedule_data=schedule_data,
         )
 
-        mk = {k: translator.get_message(k, lang) for k in [
-            "msg_success_edited", "msg_success_id", "msg_success_schedule", "msg_success_target",
-        ]}
-        text = (
-            f"{mk['msg_success_edited']}\n\n"
-            f"{mk['msg_success_id']}{hcode(job_id)}\n"
-            f"{mk['msg_success_schedule']}{hcode(schedule_data['description'])}\n"
-            f"{mk['msg_success_target']}{hcode(original_job['chat_id'])}\n"
-        )
+        text = _success_text(translator, lang, "msg_success_edited", job_id, schedule_data["description"], original_job["chat_id"])
         await message.answer(text, reply_markup=kb.success_keyboard(translator, lang, job_id))
         await state.clear()
 
     except Exception as e:
         logger.error("Error editing schedule: %s", e)
-        mk = {k: translator.get_message(k, lang) for k in [
-            "msg_error_edit", "msg_error_retry", "msg_error_restart",
-        ]}
-        error_text = (
-            f"{mk['msg_error_edit']}{e}\n\n"
-            f"{mk['msg_error_retry']}\n"
-            f"{mk['msg_error_restart']}"
-        )
+        error_text = _error_text(translator, lang, "msg_error_edit", e)
         await message.answer(error_text, reply_markup=kb.restart_button(translator, lang))
 
@@ -2,17 +2,75 @@
 Shared helpers used by both handlers and callbacks routers.
 """
 
+import asyncio
+import functools
 import logging
-from typing import List, Dict
+import time
+from typing import Any, Coroutine, List, Dict, NamedTuple, Set, Tuple
 
 from aiogram import Bot
+from aiogram.types import BotCommand, InlineKeyboardMarkup
 from aiogram.utils.markdown import hbold, hcode, hitalic
 
 from src.bot.database import Database
 from src.bot.translation_service import TranslationService
+from src.bot import keyboards as kb
 
 logger = logging.getLogger(__name__)
 
+_BOT_COMMANDS = ("start", "help", "schedule", "list", "manage", "timezone")
+_COMMAND_KEYS = tuple(f"cmd_{c}" for c in _BOT_COMMANDS)
+
+# (bot id, language) pairs whose menu commands were already pushed to Telegram.
+_commands_synced: Set[Tuple[int, str]] = set()
+
+# Chats recently confirmed reachable: (bot id, chat id) -> monotonic time of the check.
+# Only successes are remembered, so a user who has just added the bot can retry at once.
+_reachable_chats: Dict[Tuple[int, str], float] = {}
+REACHABLE_CHAT_TTL = 60.0
+_REACHABLE_CHATS_MAX = 10_000
+
+# Strong references to fire-and-forget tasks so they are not garbage-collected mid-flight.
+_background_tasks: Set["asyncio.Task[Any]"] = set()
+
+_HELP_KEYS = (
+    "msg_help_title", "msg_help_section_create", "msg_help_step1",
+    "msg_help_step2", "msg_help_step3", "msg_help_step4", "msg_help_step5",
+    "msg_help_examples", "msg_help_daily", "msg_help_every_minutes",
+    "msg_help_every_hours", "msg_help_every_seconds", "msg_help_cron_examples",
+    "msg_help_cron_monday", "msg_help_cron_weekdays", "msg_help_cron_monthly",
+    "msg_help_cron_15th", "msg_help_cron_15min", "msg_help_commands",
+    "msg_help_cmd_schedule", "msg_help_cmd_list", "msg_help_cmd_manage",
+    "msg_help_cmd_help", "msg_help_tip",
+)
+_STEP3_KEYS = (
+    "msg_schedule_step3_title", "msg_schedule_examples",
+    "msg_help_daily", "msg_help_every_minutes", "msg_help_every_hours",
+    "msg_help_cron_monday", "msg_schedule_step3_hint",
+)
+_LIST_KEYS = (
+    "msg_list_title", "msg_list_status_active", "msg_list_status_paused", "msg_list_use_manage",
+)
+_JOB_KEYS = (
+    "msg_list_status_paused", "msg_list_status_active",
+)
+
+
+class JobLabels(NamedTuple):
+    """Translated field prefixes of a job entry (one set per view and language)."""
+
+    id: str
+    status: str
+    target: str
+    message: str
+    schedule: str
+
+
+@functools.lru_cache(maxsize=64)
+def job_labels(tr: TranslationService, lang: str, prefix: str = "msg_job") -> JobLabels:
+    """Return the job-entry labels for *lang*; *prefix* is ``msg_job`` or ``msg_list``."""
+    return JobLabels(*(tr.get_message(f"{prefix}_{field}", lang) for field in JobLabels._fields))
+
 
 async def get_lang(db: Database, user_id: int) -> str:
     """Get user language preference with fallback."""
@@ -22,32 +80,77 @@ async def get_lang(db: Database, user_id: int) -> str:
         return "ru"
 
 
+def run_in_background(coro: Coroutine[Any, Any, Any]) -> None:
+    """Schedule *coro* without awaiting it; errors are logged, not raised."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_background_done)
+
+
+def _on_background_done(task: "asyncio.Task[Any]") -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background task failed: %s", task.exception())
+
+
+async def drain_background_tasks() -> None:
+    """Wait for outstanding background tasks (used on shutdown)."""
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
+
+
 async def validate_chat_id(bot: Bot, chat_id: str) -> bool:
     """Check whether the bot can reach the given chat_id.
 
-    Returns True if reachable, False otherwise.
+    Returns True if reachable, False otherwise. Positive answers are reused
+    for REACHABLE_CHAT_TTL seconds.
     """
+    key = (bot.id, chat_id)
+    now = time.monotonic()
+    checked = _reachable_chats.get(key)
+    if checked is not None and now - checked < REACHABLE_CHAT_TTL:
+        return True
     try:
         await bot.get_chat(chat_id)
-        return True
     except Exception as e:
+        _reachable_chats.pop(key, None)
         logger.debug("Chat %s is unreachable: %s", chat_id, e)
         return False
+    if len(_reachable_chats) >= _REACHABLE_CHATS_MAX:
+        _reachable_chats.clear()
+    _reachable_chats[key] = now
+    return True
+
+
+async def sync_bot_commands(bot: Bot, tr: TranslationService, lang: str) -> None:
+    """Publish the localized command menu for *lang* once per bot and process."""
+    key = (bot.id, lang)
+    if key in _commands_synced:
+        return
+    m = tr.get_messages(_COMMAND_KEYS, lang)
+    commands = [BotCommand(command=c, description=m[k]) for c, k in zip(_BOT_COMMANDS, _COMMAND_KEYS)]
+    await bot.set_my_commands(commands, language_code=lang)
+    _commands_synced.add(key)
+
 
+def describe_error(exc: Exception, tr: TranslationService, lang: str) -> str:
+    """Return a user-safe description of *exc*.
 
+    ValueErrors are raised by our own services with readable messages. A
+    RuntimeError means the AI request itself failed; anything else may carry
+    driver or HTTP internals, so a generic translated message is shown.
+    """
+    if isinstance(exc, ValueError):
+        return str(exc)
+    if isinstance(exc, RuntimeError):
+        return tr.get_message("msg_error_ai_unavailable", lang)
+    return tr.get_message("msg_error_internal", lang)
+
+
+@functools.lru_cache(maxsize=64)
 def build_help_text(tr: TranslationService, lang: str) -> str:
     """Build the full /help message text."""
-    keys = [
-        "msg_help_title", "msg_help_section_create", "msg_help_step1",
-        "msg_help_step2", "msg_help_step3", "msg_help_step4", "msg_help_step5",
-        "msg_help_examples", "msg_help_daily", "msg_help_every_minutes",
-        "msg_help_every_hours", "msg_help_every_seconds", "msg_help_cron_examples",
-        "msg_help_cron_monday", "msg_help_cron_weekdays", "msg_help_cron_monthly",
-        "msg_help_cron_15th", "msg_help_cron_15min", "msg_help_commands",
-        "msg_help_cmd_schedule", "msg_help_cmd_list", "msg_help_cmd_manage",
-        "msg_help_cmd_help", "msg_help_tip",
-    ]
-    m = {k: tr.get_message(k, lang) for k in keys}
+    m = tr.get_messages(_HELP_KEYS, lang)
     return (
         f"{m['msg_help_title']}\n\n"
         f"{m['msg_help_section_create']}\n"
@@ -67,47 +170,150 @@ def build_help_text(tr: TranslationService, lang: str) -> str:
     )
 
 
+@functools.lru_cache(maxsize=64)
+def build_start_text(tr: TranslationService, lang: str) -> str:
+    """Build the /start greeting (static per language)."""
+    return f"{tr.get_message('msg_start_title', lang)}\n\n{tr.get_message('msg_start_description', lang)}"
+
+
+@functools.lru_cache(maxsize=64)
+def build_schedule_step1_text(tr: TranslationService, lang: str) -> str:
+    """Build the "where should it go?" wizard prompt (static per language)."""
+    return (
+        f"{tr.get_message('msg_schedule_title', lang)}\n\n"
+        f"{tr.get_message('msg_schedule_step1', lang)}\n"
+        f"{tr.get_message('msg_schedule_step1_hint', lang)}"
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def build_schedule_step3_text(tr: TranslationService, lang: str) -> str:
+    """Build the "how should it repeat?" wizard prompt (static per language)."""
+    m = tr.get_messages(_STEP3_KEYS, lang)
+    return (
+        f"{m['msg_schedule_step3_title']}\n\n"
+        f"{m['msg_schedule_examples']}\n"
+        f"{m['msg_help_daily']}\n{m['msg_help_every_minutes']}\n"
+        f"{m['msg_help_every_hours']}\n{m['msg_help_cron_monday']}\n\n"
+        f"{m['msg_schedule_step3_hint']}"
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _message_preview(message: str, limit: int = 50) -> str:
+    """Truncate *message* to *limit* characters, adding an ellipsis when cut."""
+    return message[:limit] + "…" if len(message) > limit else message
+
+
+@functools.lru_cache(maxsize=4096)
+def _render_job_entry(
+    labels: JobLabels,
+    job_id: str,
+    status: str,
+    target: str,
+    message: str,
+    schedule: str,
+) -> str:
+    """Render the ID / Status / Target / Message / Schedule block of one job.
+
+    Shared by the /list and /manage views; *labels* carries the per-view,
+    per-language field prefixes. All arguments are strings, so results are
+    memoized and a pause/resume simply hits a different *status* key.
+    """
+    return _entry_template(labels).format_map({
+        "job_id": hcode(job_id),
+        "status": status,
+        "target": hcode(target),
+        "message": hitalic(message),
+        "schedule": hcode(schedule),
+    })
+
+
+def _escape_braces(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+@functools.lru_cache(maxsize=64)
+def _entry_template(labels: JobLabels) -> str:
+    """Bake the translated *labels* into a format_map template for one job entry."""
+    id_lbl, status_lbl, target_lbl, message_lbl, schedule_lbl = map(_escape_braces, labels)
+    return (
+        f"{id_lbl}{{job_id}}\n"
+        f"{status_lbl}{{status}}\n"
+        f"{target_lbl}{{target}}\n"
+        f"{message_lbl}{{message}}\n"
+        f"{schedule_lbl}{{schedule}}\n"
+    )
+
+
 def build_list_text(schedules: List[Dict], tr: TranslationService, lang: str) -> str:
     """Build the /list message text from a list of schedule dicts."""
-    keys = [
-        "msg_list_title", "msg_list_status_active", "msg_list_status_paused",
-        "msg_list_id", "msg_list_status", "msg_list_target",
-        "msg_list_message", "msg_list_schedule", "msg_list_use_manage",
-    ]
-    m = {k: tr.get_message(k, lang) for k in keys}
+    m = tr.get_messages(_LIST_KEYS, lang)
+    labels = job_labels(tr, lang, "msg_list")
 
-    text = f"{m['msg_list_title']}\n\n"
+    parts = [m["msg_list_title"], "\n\n"]
+    append = parts.append
     for job in schedules:
         status = m["msg_list_status_paused"] if job["is_paused"] else m["msg_list_status_active"]
         desc = job["schedule_data"].get("description", "Unknown")
-        msg_preview = job["message"][:50] + ("…" if len(job["message"]) > 50 else "")
-        text += (
-            f"{m['msg_list_id']}{hcode(job['job_id'])}\n"
-            f"{m['msg_list_status']}{status}\n"
-            f"{m['msg_list_target']}{hcode(job['chat_id'])}\n"
-            f"{m['msg_list_message']}{hitalic(msg_preview)}\n"
-            f"{m['msg_list_schedule']}{hcode(desc)}\n"
-            "─────────────\n"
-        )
-    text += f"\n{m['msg_list_use_manage']}"
-    return text
+        append(_render_job_entry(labels, job["job_id"], status, job["chat_id"], _message_preview(job["message"]), desc))
+        append("─────────────\n")
+    append("\n")
+    append(m["msg_list_use_manage"])
+    return "".join(parts)
 
 
 def build_job_text(job: dict, tr: TranslationService, lang: str) -> str:
     """Build a single job card text for /manage view."""
-    keys = [
-        "msg_list_status_paused", "msg_list_status_active",
-        "msg_job_id", "msg_job_status", "msg_job_target",
-        "msg_job_message", "msg_job_schedule",
-    ]
-    m = {k: tr.get_message(k, lang) for k in keys}
+    m = tr.get_messages(_JOB_KEYS, lang)
     status = m["msg_list_status_paused"] if job.get("is_paused") else m["msg_list_status_active"]
     sched_desc = job.get("schedule_data", {}).get("description") or job.get("schedule", "")
-    return (
-        f"{m['msg_job_id']}{hcode(job.get('job_id', ''))}\n"
-        f"{m['msg_job_status']}{status}\n"
-        f"{m['msg_job_target']}{hcode(job.get('chat_id', ''))}\n"
-        f"{m['msg_job_message']}{hitalic(job.get('message', ''))}\n"
-        f"{m['msg_job_schedule']}{hcode(sched_desc)}\n"
+    labels = job_labels(tr, lang)
+    return _render_job_entry(
+        labels, job.get("job_id", ""), status, job.get("chat_id", ""), job.get("message", ""), sched_desc
     )
 
+
+@functools.lru_cache(maxsize=64)
+def _confirm_delete_template(tr: TranslationService, lang: str) -> str:
+    return _escape_braces(tr.get_message("msg_confirm_delete", lang)) + "{job_id}\n\n{job}"
+
+
+def build_confirm_delete_text(job: dict, tr: TranslationService, lang: str) -> str:
+    """Build the "really delete?" prompt shown above a job card."""
+    return _confirm_delete_template(tr, lang).format_map({
+        "job_id": hcode(job["job_id"]),
+        "job": build_job_text(job, tr, lang),
+    })
+
+
+@functools.lru_cache(maxsize=64)
+def _deleted_template(tr: TranslationService, lang: str) -> str:
+    labels = job_labels(tr, lang)
+    deleted = tr.get_message("msg_list_status_deleted", lang)
+    return f"{_escape_braces(labels.id)}{{job_id}}\n{_escape_braces(labels.status + deleted)}\n"
+
+
+def build_deleted_text(job_id: str, tr: TranslationService, lang: str) -> str:
+    """Build the card text that replaces a job once it has been deleted."""
+    return _deleted_template(tr, lang).format_map({"job_id": hcode(job_id)})
+
+
+@functools.lru_cache(maxsize=64)
+def _chat_unreachable_template(tr: TranslationService, lang: str) -> str:
+    return _escape_braces(tr.get_message("msg_chat_unreachable", lang)).replace("{{chat_id}}", "{chat_id}")
+
+
+def build_chat_unreachable_text(chat_id: str, tr: TranslationService, lang: str) -> str:
+    """Build the warning shown when the bot cannot post to *chat_id*."""
+    return _chat_unreachable_template(tr, lang).format_map({"chat_id": chat_id})
+
+
+def build_manage_view(
+    schedules: List[Dict], tr: TranslationService, lang: str
+) -> List[Tuple[str, InlineKeyboardMarkup]]:
+    """Build the (text, markup) pair for every job card of the /manage view."""
+    return [
+        (build_job_text(job, tr, lang), kb.job_manage_keyboard(tr, lang, job["job_id"], job["is_paused"]))
+        for job in schedules
+    ]
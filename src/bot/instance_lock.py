@@ -0,0 +1,67 @@
+"""
+Inter-process leader lock for the scheduler.
+"""
+
+import logging
+import os
+from typing import IO, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class InstanceLock:
+    """Non-blocking exclusive lock on a file shared by every bot process.
+
+    Each process restores its jobs from the shared database, so two replicas
+    would both fire every schedule. Only the process holding this lock starts
+    the scheduler. The OS drops the lock when the holder exits, even on a crash.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh: Optional[IO[str]] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fh is not None
+
+    def acquire(self) -> bool:
+        """Try to take the lock; return False if another process holds it."""
+        if self._fh is not None:
+            return True
+        try:
+            fh = open(self.path, "a+")
+        except OSError as e:
+            logger.error("Cannot open scheduler lock %s: %s", self.path, e)
+            return False
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fh.close()
+            return False
+        self._fh = fh
+        return True
+
+    def release(self) -> None:
+        if self._fh is None:
+            return
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                self._fh.seek(0)
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError as e:
+            logger.warning("Failed to unlock %s: %s", self.path, e)
+        finally:
+            # Closing the descriptor releases a POSIX flock.
+            self._fh.close()
+            self._fh = None
@@ -1,14 +1,19 @@
 """
 Inline keyboard builders.
+
+Keyboards are memoized on their (hashable) arguments, so callers must treat
+the returned markup as read-only.
 """
 
-from typing import List
+import functools
+from typing import List, Tuple
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from src.bot.translation_service import TranslationService
 
 
+@functools.lru_cache(maxsize=64)
 def start_keyboard(tr: TranslationService, lang: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -25,6 +30,7 @@ def start_keyboard(tr: TranslationService, lang: str) -> InlineKeyboardMarkup:
     )
 
 
+@functools.lru_cache(maxsize=64)
 def help_keyboard(tr: TranslationService, lang: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -37,6 +43,7 @@ def help_keyboard(tr: TranslationService, lang: str) -> InlineKeyboardMarkup:
     )
 
 
+@functools.lru_cache(maxsize=64)
 def schedule_step1_keyboard(
     tr: TranslationService, lang: str, has_recent_contacts: bool = False
 ) -> InlineKeyboardMarkup:
@@ -50,8 +57,9 @@ def schedule_step1_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
+@functools.lru_cache(maxsize=1024)
 def saved_contacts_keyboard(
-    tr: TranslationService, lang: str, contacts: List[int]
+    tr: TranslationService, lang: str, contacts: Tuple[int, ...]
 ) -> InlineKeyboardMarkup:
     rows = [
         [InlineKeyboardButton(text=str(c), callback_data=f"schedule:select_contact:{c}")]
@@ -60,6 +68,7 @@ def saved_contacts_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
+@functools.lru_cache(maxsize=4096)
 def job_manage_keyboard(
     tr: TranslationService, lang: str, job_id: str, is_paused: bool
 ) -> InlineKeyboardMarkup:
@@ -79,6 +88,7 @@ def job_manage_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=[row1, row2])
 
 
+@functools.lru_cache(maxsize=4096)
 def confirm_delete_keyboard(
     tr: TranslationService, lang: str, job_id: str
 ) -> InlineKeyboardMarkup:
@@ -114,6 +124,7 @@ def success_keyboard(
     )
 
 
+@functools.lru_cache(maxsize=64)
 def manage_button(tr: TranslationService, lang: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -145,6 +156,7 @@ def edit_message_keyboard(tr: TranslationService, lang: str, job_id: str) -> Inl
     )
 
 
+@functools.lru_cache(maxsize=64)
 def timezone_keyboard(tr: TranslationService, lang: str) -> InlineKeyboardMarkup:
     # Common timezones to choose from
     common_tz = ["UTC", "Europe/London", "Europe/Warsaw", "Europe/Moscow", "America/New_York", "Asia/Tokyo", "Asia/Dubai"]
@@ -156,6 +168,7 @@ def timezone_keyboard(tr: TranslationService, lang: str) -> InlineKeyboardMarkup
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
+@functools.lru_cache(maxsize=64)
 def restart_button(tr: TranslationService, lang: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
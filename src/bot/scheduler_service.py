@@ -2,30 +2,88 @@
 Scheduler service built on APScheduler AsyncIOScheduler.
 """
 
+import functools
 import logging
-from typing import Any, Callable, Coroutine, Dict, Set, Tuple
+import re
+from typing import Any, Awaitable, Callable, Coroutine, Dict, FrozenSet, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
 
-import pytz
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
-from src.bot.config import WARSAW_TZ
+from src.bot.config import SCHEDULER_MAX_INSTANCES, SCHEDULER_MISFIRE_GRACE_TIME, WARSAW_TZ
+from src.bot.cron import CRON_EXPR_RE, CRON_FIELD_RE
 
 logger = logging.getLogger(__name__)
 
+_DOW_NAME_RE = re.compile(r"SUN|MON|TUE|WED|THU|FRI|SAT", flags=re.IGNORECASE)
+# Crontab day-of-week number (0/7 = Sunday) -> APScheduler number (0 = Monday).
+_DOW_MAP: Dict[str, str] = {"0": "6", "1": "0", "2": "1", "3": "2", "4": "3", "5": "4", "6": "5", "7": "6"}
+
+
+def _dow_number(value: str) -> Optional[str]:
+    """Map one crontab weekday number ("07" included) to APScheduler numbering."""
+    return _DOW_MAP.get(str(int(value))) if value.isdigit() else None
+
+
+def _convert_dow(dow: str) -> str:
+    """Shift one crontab day-of-week field to APScheduler numbering."""
+    if dow in ("*", "?"):
+        return dow
+    if "," in dow:
+        return ",".join(_convert_dow(item) for item in dow.split(","))
+    base, slash, step = dow.partition("/")
+    if slash:
+        # A step picks days by crontab position, so expand it before shifting.
+        if base == "*":
+            start, end = "0", "6"
+        else:
+            start, _sep, end = base.partition("-")
+            end = end or "7"
+        if not (start.isdigit() and end.isdigit() and step.isdigit() and int(step) > 0):
+            return dow
+        days = {_dow_number(str(day)) for day in range(int(start), int(end) + 1, int(step))}
+        if None in days:
+            return dow
+        return ",".join(sorted(days, key=int))
+    if "-" in dow:
+        a, b = dow.split("-", 1)
+        cs, ce = _dow_number(a), _dow_number(b)
+        if cs is None or ce is None:
+            return dow
+        return f"{cs}-{ce}" if int(cs) <= int(ce) else f"{cs}-6,0-{ce}"
+    return _dow_number(dow) or dow
+
+
+@functools.lru_cache(maxsize=256)
+def _build_cron_trigger(expression: str, timezone: str) -> CronTrigger:
+    """Build (and memoize) the trigger for an APScheduler-format crontab.
+
+    CronTrigger is immutable once built, so jobs sharing a schedule and
+    timezone can share one instance across loads and pause/resume cycles.
+    """
+    return CronTrigger.from_crontab(expression, timezone=ZoneInfo(timezone))
+
 
 class SchedulerService:
-    """Manages async cron-based jobs via APScheduler."""
+    """Manages async cron-based jobs via APScheduler.
+
+    Only the process holding the scheduler lock starts APScheduler. In the
+    other processes job calls just validate their input; the database row is
+    the source of truth and the leader picks the change up in :meth:`sync`.
+    """
 
-    VALID_DAY_NAMES: Set[str] = {
+    VALID_DAY_NAMES: FrozenSet[str] = frozenset({
         "SUN", "MON", "TUE", "WED", "THU", "FRI", "SAT",
         "0", "1", "2", "3", "4", "5", "6", "7",
-    }
-    VALID_MONTH_NAMES: Set[str] = {
+    })
+    VALID_MONTH_NAMES: FrozenSet[str] = frozenset({
         "JAN", "FEB", "MAR", "APR", "MAY", "JUN",
         "JUL", "AUG", "SEP", "OCT", "NOV", "DEC",
         "1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12",
-    }
+    })
+    _VALID_NAMES: FrozenSet[str] = VALID_DAY_NAMES | VALID_MONTH_NAMES
 
     def __init__(
         self,
@@ -35,8 +93,21 @@ class SchedulerService:
         Args:
             callback_func: async callable(chat_id, message) invoked on trigger.
         """
-        self.scheduler = AsyncIOScheduler(timezone=WARSAW_TZ)
+        self.scheduler = AsyncIOScheduler(
+            timezone=WARSAW_TZ,
+            job_defaults={
+                "coalesce": True,
+                "max_instances": SCHEDULER_MAX_INSTANCES,
+                "misfire_grace_time": SCHEDULER_MISFIRE_GRACE_TIME,
+            },
+        )
         self.callback_func = callback_func
+        # (chat_id, message, expression, timezone) of every job loaded here
+        self._sources: Dict[str, Tuple[str, str, str, str]] = {}
+        # Rows that failed to load, skipped until they change
+        self._broken: Dict[str, Tuple[str, str, str, str]] = {}
+        # Jobs changed by this process since the last sync began
+        self._touched: Set[str] = set()
 
     def start(self) -> None:
         if not self.scheduler.running:
@@ -48,6 +119,51 @@ class SchedulerService:
             self.scheduler.shutdown(wait=False)
             logger.info("AsyncIOScheduler shut down.")
 
+    @property
+    def running(self) -> bool:
+        return bool(self.scheduler.running)
+
+    async def sync(
+        self, load_schedules: Callable[[], Awaitable[List[Dict]]], timezone: str = "Europe/Warsaw"
+    ) -> Tuple[int, int, int]:
+        """Make the running jobs match the active schedules returned by *load_schedules*.
+
+        Jobs this process changed since the previous sync began are left alone
+        for one round: their database write may not have landed yet.
+
+        Returns:
+            (added, removed, failed) job counts.
+        """
+        held_back = self._touched
+        self._touched = set()
+        schedules = await load_schedules()
+        held_back |= self._touched
+
+        added = removed = failed = 0
+        wanted = set()
+        for s in schedules:
+            job_id = s["job_id"]
+            wanted.add(job_id)
+            source = (s["chat_id"], s["message"], s["schedule_data"].get("expression"), timezone)
+            if job_id in held_back or self._sources.get(job_id) == source or self._broken.get(job_id) == source:
+                continue
+            try:
+                if not source[2]:
+                    raise ValueError("schedule has no cron expression")
+                self._load_job(job_id, *source)
+                added += 1
+            except Exception as e:
+                self._broken[job_id] = source
+                failed += 1
+                logger.error("Failed to load job %s: %s", job_id, e)
+
+        for job_id in self._sources.keys() - wanted - held_back:
+            self._unload_job(job_id)
+            removed += 1
+        for job_id in self._broken.keys() - wanted:
+            del self._broken[job_id]
+        return added, removed, failed
+
     # ------------------------------------------------------------------
     # Cron validation
     # ------------------------------------------------------------------
@@ -55,42 +171,35 @@ class SchedulerService:
     def _validate_cron_field(self, field: str, field_type: str) -> bool:
         if not field:
             return False
-        if field == "*":
+        if CRON_FIELD_RE.fullmatch(field):
             return True
 
-        if "/" in field:
-            parts = field.split("/")
-            if len(parts) != 2:
-                return False
-            base, step = parts
-            try:
-                int(step)
-            except ValueError:
-                return False
-            return base == "*" or self._validate_cron_field(base, field_type)
-
-        if "-" in field:
-            parts = field.split("-")
-            if len(parts) != 2:
+        # Lenient fallback: check each list item in one flat pass.
+        for part in field.split(","):
+            base, slash, step = part.partition("/")
+            if slash:
+                try:
+                    int(step)
+                except ValueError:
+                    return False
+            if base == "*":
+                continue
+            values = base.split("-")
+            if len(values) > 2:
                 return False
-            for p in parts:
-                if p and not p[0].isdigit() and p.upper() not in (self.VALID_DAY_NAMES | self.VALID_MONTH_NAMES):
-                    try:
-                        int(p)
-                    except ValueError:
-                        return False
-            return True
-
-        if "," in field:
-            return all(self._validate_cron_field(p, field_type) for p in field.split(","))
-
-        try:
-            int(field)
-            return True
-        except ValueError:
-            return field.upper() in (self.VALID_DAY_NAMES | self.VALID_MONTH_NAMES)
+            for value in values:
+                if value.isdigit() or value.upper() in self._VALID_NAMES or (not value and len(values) == 2):
+                    continue
+                try:
+                    int(value)
+                except ValueError:
+                    return False
+        return True
 
     def validate_cron_expression(self, expression: str) -> Tuple[bool, str]:
+        if CRON_EXPR_RE.fullmatch(expression):
+            return True, ""
+
         expression = expression.strip()
         parts = expression.split()
         if len(parts) != 5:
@@ -107,7 +216,9 @@ class SchedulerService:
     # Day-of-week conversion (Unix → APScheduler)
     # ------------------------------------------------------------------
 
-    def _convert_cron_to_apscheduler_format(self, expression: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _convert_cron_to_apscheduler_format(expression: str) -> str:
         parts = expression.split()
         if len(parts) != 5:
             return expression
@@ -117,37 +228,9 @@ class SchedulerService:
         if weekday in ("*", "?"):
             return expression
 
-        if any(n in weekday.upper() for n in ("SUN", "MON", "TUE", "WED", "THU", "FRI", "SAT")):
+        if _DOW_NAME_RE.search(weekday):
             return expression
 
-        def _convert_dow(dow: str) -> str:
-            if dow in ("*", "?"):
-                return dow
-            if "-" in dow and "," not in dow:
-                a, b = dow.split("-", 1)
-                try:
-                    s, e = int(a), int(b)
-                    cs, ce = (s - 1) % 7, (e - 1) % 7
-                    return f"{cs}-{ce}" if cs <= ce else f"{cs},0-{ce}"
-                except (ValueError, IndexError):
-                    return dow
-            if "," in dow:
-                items = dow.split(",")
-                converted = []
-                for item in items:
-                    if "-" in item:
-                        converted.append(_convert_dow(item))
-                    else:
-                        try:
-                            converted.append(str((int(item) - 1) % 7))
-                        except ValueError:
-                            converted.append(item)
-                return ",".join(converted)
-            try:
-                return str((int(dow) - 1) % 7)
-            except ValueError:
-                return dow
-
         return f"{minute} {hour} {day} {month} {_convert_dow(weekday)}"
 
     # ------------------------------------------------------------------
@@ -169,27 +252,52 @@ class SchedulerService:
         aps_expr = self._convert_cron_to_apscheduler_format(cron_expression)
 
         try:
-            tz = pytz.timezone(timezone)
-            trigger = CronTrigger.from_crontab(aps_expr, timezone=tz)
-            self.scheduler.add_job(
-                self.callback_func,
-                trigger,
-                args=[chat_id, message],
-                id=job_id,
-                replace_existing=True,
-            )
+            trigger = _build_cron_trigger(aps_expr, timezone)
+            if self.scheduler.running:
+                self._touched.add(job_id)
+                self._load_job(job_id, chat_id, message, cron_expression, timezone, trigger)
             description = f"Cron: {cron_expression} ({timezone})"
             return {"expression": cron_expression, "description": description}
         except Exception as e:
             logger.error("Error adding job %s: %s", job_id, e)
             raise ValueError(f"Failed to create trigger: {e}") from e
 
+    def _load_job(
+        self, job_id: str, chat_id: str, message: str, cron_expression: str, timezone: str,
+        trigger: Optional[CronTrigger] = None,
+    ) -> None:
+        if trigger is None:
+            is_valid, err = self.validate_cron_expression(cron_expression)
+            if not is_valid:
+                raise ValueError(f"Invalid cron format: {cron_expression}. {err}")
+            trigger = _build_cron_trigger(self._convert_cron_to_apscheduler_format(cron_expression), timezone)
+        self.scheduler.add_job(
+            self.callback_func,
+            trigger,
+            args=[chat_id, message],
+            id=job_id,
+            replace_existing=True,
+        )
+        self._broken.pop(job_id, None)
+        self._sources[job_id] = (chat_id, message, cron_expression, timezone)
+
+    def _unload_job(self, job_id: str) -> None:
+        self._sources.pop(job_id, None)
+        try:
+            self.scheduler.remove_job(job_id)
+        except JobLookupError:
+            pass
+
     def pause_job(self, job_id: str) -> bool:
+        if not self.scheduler.running:
+            return True
+        self._touched.add(job_id)
+        self._sources.pop(job_id, None)
         try:
-            if self.scheduler.get_job(job_id):
-                self.scheduler.remove_job(job_id)
-                logger.info("Job %s paused (removed).", job_id)
-                return True
+            self.scheduler.remove_job(job_id)
+            logger.info("Job %s paused (removed).", job_id)
+            return True
+        except JobLookupError:
             return False
         except Exception as e:
             logger.error("Error pausing job %s: %s", job_id, e)
@@ -207,11 +315,16 @@ class SchedulerService:
             return False
 
     def delete_job(self, job_id: str) -> bool:
-        try:
-            if self.scheduler.get_job(job_id):
-                self.scheduler.remove_job(job_id)
+        if not self.scheduler.running:
             return True
+        self._touched.add(job_id)
+        self._sources.pop(job_id, None)
+        try:
+            self.scheduler.remove_job(job_id)
+        except JobLookupError:
+            pass
         except Exception as e:
             logger.error("Error deleting job %s: %s", job_id, e)
             return False
+        return True
 
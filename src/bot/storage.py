@@ -0,0 +1,78 @@
+"""
+Bounded in-memory FSM storage.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from aiogram.exceptions import DataNotDictLikeError
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorageRecord
+
+
+class BoundedMemoryStorage(BaseStorage):
+    """MemoryStorage variant that forgets idle and least-recently-used users.
+
+    aiogram's MemoryStorage creates a record for every chat that ever sends an
+    update and never drops it, so abandoned wizards accumulate forever. Here
+    records expire after *ttl* seconds without access and the table is capped
+    at *max_size* entries.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl: float = 1800.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._records: "OrderedDict[StorageKey, Tuple[MemoryStorageRecord, float]]" = OrderedDict()
+
+    def _get(self, key: StorageKey) -> Optional[MemoryStorageRecord]:
+        entry = self._records.get(key)
+        if entry is None:
+            return None
+        record, touched = entry
+        now = time.monotonic()
+        if now - touched > self.ttl:
+            del self._records[key]
+            return None
+        self._records[key] = (record, now)
+        self._records.move_to_end(key)
+        return record
+
+    def _get_or_create(self, key: StorageKey) -> MemoryStorageRecord:
+        record = self._get(key)
+        if record is None:
+            record = MemoryStorageRecord()
+            self._records[key] = (record, time.monotonic())
+            while len(self._records) > self.max_size:
+                self._records.popitem(last=False)
+        return record
+
+    def _drop_if_empty(self, key: StorageKey, record: MemoryStorageRecord) -> None:
+        if record.state is None and not record.data:
+            self._records.pop(key, None)
+
+    async def close(self) -> None:
+        self._records.clear()
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = self._get_or_create(key)
+        record.state = state.state if isinstance(state, State) else state
+        self._drop_if_empty(key, record)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        record = self._get(key)
+        return record.state if record else None
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            raise DataNotDictLikeError(
+                f"Data must be a dict or dict-like object, got {type(data).__name__}"
+            )
+        record = self._get_or_create(key)
+        record.data = data.copy()
+        self._drop_if_empty(key, record)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        record = self._get(key)
+        return record.data.copy() if record else {}
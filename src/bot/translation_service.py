@@ -6,12 +6,14 @@ Loads translation strings from locale JSON files.
 import json
 import logging
 import os
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_LANG = "ru"
 
+_NO_MESSAGES: Dict[str, str] = {}
+
 
 class TranslationService:
     """Load and serve translated button labels and messages from locales/*.json."""
@@ -20,6 +22,7 @@ class TranslationService:
         self.locales_dir = locales_dir
         self.default_lang = default_lang
         self._cache: Dict[str, Dict[str, str]] = {}
+        self._bundles: Dict[Tuple[str, Tuple[str, ...]], Dict[str, str]] = {}
 
         if os.path.exists(self.locales_dir) and os.path.isdir(self.locales_dir):
             for fname in os.listdir(self.locales_dir):
@@ -36,19 +39,38 @@ class TranslationService:
         path = os.path.join(self.locales_dir, f"{lang}.json")
         with open(path, "r", encoding="utf-8") as fh:
             self._cache[lang] = json.load(fh)
+        self._bundles.clear()
 
     def _resolve_lang(self, lang: str | None) -> str:
         if lang is None or lang not in self._cache:
             return self.default_lang
         return lang
 
+    def _messages(self, lang: str | None) -> Dict[str, str]:
+        """Return the loaded table for *lang*, falling back to the default language."""
+        messages = self._cache.get(lang) if lang is not None else None
+        if messages is None:
+            messages = self._cache.get(self.default_lang, _NO_MESSAGES)
+        return messages
+
     def get_message(self, key: str, lang: str | None = None) -> str:
+        return self._messages(lang).get(key, key)
+
+    def get_messages(self, keys: Tuple[str, ...], lang: str | None = None) -> Dict[str, str]:
+        """Return ``{key: message}`` for *keys*, memoized per (lang, keys).
+
+        The returned dict is shared between callers and must not be mutated.
+        """
         lang = self._resolve_lang(lang)
-        return self._cache.get(lang, {}).get(key, key)
+        cache_key = (lang, keys)
+        bundle = self._bundles.get(cache_key)
+        if bundle is None:
+            messages = self._cache.get(lang, _NO_MESSAGES)
+            bundle = self._bundles[cache_key] = {k: messages.get(k, k) for k in keys}
+        return bundle
 
     def get_button(self, key: str, lang: str | None = None) -> str:
-        lang = self._resolve_lang(lang)
-        return self._cache.get(lang, {}).get(key, key)
+        return self._messages(lang).get(key, key)
 
     def available_languages(self) -> List[str]:
         return list(self._cache.keys())
@@ -6,11 +6,15 @@ Covers:
 3. Bot + Dispatcher construction and wiring.
 """
 
+import asyncio
+
 import pytest
 import pytest_asyncio
 
+from src.bot.ai_service import AIService
 from src.bot.database import Database
 from src.bot.scheduler_service import SchedulerService
+from src.bot.translation_service import TranslationService
 
 
 # --- Database Smoke Tests ---
@@ -45,10 +49,18 @@ async def test_database_smoke(temp_db):
     assert schedules[0]["job_id"] == "smoke_job_1"
     assert schedules[0]["message"] == "Smoke Test"
 
+    # Retrieve one (scoped to its owner)
+    single = await db.get_schedule("smoke_job_1", user_id=101)
+    assert single == schedules[0]
+    assert await db.get_schedule("smoke_job_1", user_id=999) is None
+
+    assert [s["job_id"] for s in await db.get_active_schedules()] == ["smoke_job_1"]
+
     # Update (Pause)
     await db.update_schedule_pause_status("smoke_job_1", True)
     updated = (await db.get_schedules(user_id=101))[0]
     assert updated["is_paused"] is True
+    assert await db.get_active_schedules() == []
 
     # Delete
     await db.delete_schedule("smoke_job_1")
@@ -71,6 +83,12 @@ async def test_user_language_smoke(temp_db):
     await db.set_user_language(999, "ru")
     assert await db.get_user_language(999) == "ru"
 
+    # The per-user cache stays bounded
+    db.LANG_CACHE_MAX = 3
+    for user_id in range(10):
+        await db.get_user_language(user_id)
+    assert len(db._lang_cache) <= 3
+
 
 @pytest.mark.asyncio
 async def test_user_timezone_smoke(temp_db):
@@ -89,6 +107,19 @@ async def test_user_timezone_smoke(temp_db):
     assert await db.get_user_timezone(888) == "Asia/Tokyo"
 
 
+@pytest.mark.asyncio
+async def test_recent_chat_ids_smoke(temp_db):
+    """Verify recent chat_ids are stored most-recent-first and reported."""
+    db = temp_db
+
+    assert await db.has_recent_chat_ids(777) is False
+    await db.add_recent_chat_id(777, 1)
+    await db.add_recent_chat_id(777, 2)
+    await db.add_recent_chat_id(777, 1)
+    assert await db.get_recent_chat_ids(777) == [1, 2]
+    assert await db.has_recent_chat_ids(777) is True
+
+
 # --- Scheduler Smoke Tests ---
 
 @pytest.fixture
@@ -123,12 +154,334 @@ def test_scheduler_pause_delete(scheduler_service):
     assert scheduler_service.delete_job("smoke_job_1") is True
 
 
+def test_scheduler_pause_delete_missing(scheduler_service):
+    """Verify missing jobs are reported without a separate lookup."""
+    from apscheduler.jobstores.base import JobLookupError
+
+    scheduler_service.scheduler.remove_job.side_effect = JobLookupError("gone")
+    assert scheduler_service.pause_job("gone") is False
+    assert scheduler_service.delete_job("gone") is True
+    scheduler_service.scheduler.get_job.assert_not_called()
+
+
+def test_scheduler_follower_only_validates():
+    """Verify a process that never started APScheduler just validates job calls."""
+    service = SchedulerService(lambda *a: None)
+    assert service.add_job("f1", "202", "msg", "0 9 * * *")["expression"] == "0 9 * * *"
+    assert service.scheduler.get_jobs() == []
+    assert service.pause_job("restored_elsewhere") is True
+    assert service.delete_job("restored_elsewhere") is True
+    with pytest.raises(ValueError, match="Invalid cron"):
+        service.add_job("f2", "202", "msg", "not a cron")
+
+
+@pytest.mark.asyncio
+async def test_scheduler_sync_smoke():
+    """Verify the leader loads, reloads and drops jobs to match the database."""
+    async def noop(*args):
+        pass
+
+    def row(job_id, expression, message="msg"):
+        return {"job_id": job_id, "chat_id": "202", "message": message, "schedule_data": {"expression": expression}}
+
+    rows = [
+        row("bad", "not a cron"),
+        {"job_id": "legacy", "chat_id": "202", "message": "msg", "schedule_data": {"interval": 5}},
+        row("a", "0 9 * * *"),
+        row("b", "*/5 * * * *"),
+    ]
+
+    async def load():
+        return rows
+
+    service = SchedulerService(noop)
+    service.start()
+    try:
+        assert await service.sync(load) == (2, 0, 2)
+        assert await service.sync(load) == (0, 0, 0)  # "bad" is not retried until it changes
+
+        # Edited and deleted in another process
+        rows = [row("a", "0 9 * * *", message="edited")]
+        assert await service.sync(load) == (1, 1, 0)
+        assert service.scheduler.get_job("a").args == ("202", "edited")
+        assert service.scheduler.get_job("b") is None
+
+        # A local change waits one round for its database write
+        service.add_job("c", "202", "msg", "0 10 * * *")
+        assert await service.sync(load) == (0, 0, 0)
+        assert service.scheduler.get_job("c") is not None
+        assert await service.sync(load) == (0, 1, 0)
+    finally:
+        service.shutdown()
+
+
 def test_scheduler_invalid_cron(scheduler_service):
     """Verify scheduler rejects invalid cron."""
     with pytest.raises(ValueError, match="Invalid cron"):
         scheduler_service.add_job("bad", "202", "msg", "not a cron")
 
 
+@pytest.mark.parametrize("expr, valid", [
+    ("*,5 * * * *", True),
+    ("0 9 * * MON,*/2", True),
+    ("0 9-17/2 1,15 JAN-MAR *", True),
+    ("0 9 * * 1-2-3", False),
+    ("0 9 * * x", False),
+    ("0 9 * */x *", False),
+])
+def test_scheduler_validate_cron_fields(scheduler_service, expr, valid):
+    """Verify field validation, including wildcards inside lists."""
+    assert scheduler_service.validate_cron_expression(expr)[0] is valid
+
+
+@pytest.mark.parametrize("expr, expected", [
+    ("0 9 * * 0", "0 9 * * 6"),
+    ("0 9 * * 1-5", "0 9 * * 0-4"),
+    ("0 9 * * 1,3,5", "0 9 * * 0,2,4"),
+    ("0 9 * * 0,2-4", "0 9 * * 6,1-3"),
+    ("0 9 * * 5-1", "0 9 * * 4-6,0-0"),
+    ("0 9 * * 07", "0 9 * * 6"),
+    ("0 9 * * 1-5/2", "0 9 * * 0,2,4"),
+    ("0 9 * * */3", "0 9 * * 2,5,6"),
+    ("0 9 * * MON-FRI", "0 9 * * MON-FRI"),
+])
+def test_scheduler_dow_conversion(scheduler_service, expr, expected):
+    """Verify crontab weekdays are shifted to APScheduler numbering."""
+    assert scheduler_service._convert_cron_to_apscheduler_format(expr) == expected
+
+
+# --- AI Service Smoke Tests ---
+
+@pytest.fixture
+def ai_service(mocker):
+    """Create AIService with a mocked Groq client."""
+    mocker.patch("groq.AsyncGroq")
+    service = AIService(api_key="test")
+    service._complete = mocker.AsyncMock(return_value="0 9 * * *")
+    return service
+
+
+@pytest.mark.asyncio
+async def test_ai_cron_passthrough(ai_service):
+    """Verify cron-shaped input skips the API."""
+    assert await ai_service.parse_schedule_to_cron("  */15  * * * *") == "*/15 * * * *"
+    ai_service._complete.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("text", ["0 9 ? * MON", "0 9 * * 1-5/2,0", "*,5 100 * * *"])
+async def test_ai_passthrough_matches_scheduler(ai_service, text):
+    """Verify the AI passthrough and the scheduler agree on what is cron-shaped."""
+    valid = SchedulerService(lambda *a: None).validate_cron_expression(text)[0]
+    await ai_service.parse_schedule_to_cron(text)
+    assert ai_service._complete.await_count == (0 if valid else 1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("text, expected", [
+    ("every 15 minutes", "*/15 * * * *"),
+    ("every hour", "0 * * * *"),
+    ("every 2 hours", "0 */2 * * *"),
+    ("Every day at 9 AM", "0 9 * * *"),
+    ("daily at 9:30 pm", "30 21 * * *"),
+    ("every Monday at 10:30", "30 10 * * MON"),
+    ("every thurs at 7am", "0 7 * * THU"),
+])
+async def test_ai_local_fast_path(ai_service, text, expected):
+    """Verify common phrasings are parsed without the API."""
+    assert await ai_service.parse_schedule_to_cron(text) == expected
+    ai_service._complete.assert_not_awaited()
+
+
+@pytest.mark.parametrize("text", ["every month at 9", "every monthly at 9am", "every sunrise at 6", "every satellite at 8"])
+def test_ai_local_fast_path_skips_lookalikes(text):
+    """Verify words that merely start like a weekday are left to the model."""
+    from src.bot.ai_service import _parse_locally
+
+    assert _parse_locally(text) is None
+
+
+@pytest.mark.asyncio
+async def test_ai_result_cache(ai_service):
+    """Verify repeated phrases are answered from the cache."""
+    assert await ai_service.parse_schedule_to_cron("Twice a day at nine") == "0 9 * * *"
+    assert await ai_service.parse_schedule_to_cron("twice a  day at nine") == "0 9 * * *"
+    ai_service._complete.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_ai_inflight_dedupe(ai_service):
+    """Verify concurrent identical phrases share one request."""
+    results = await asyncio.gather(
+        ai_service.parse_schedule_to_cron("Twice a day at nine"),
+        ai_service.parse_schedule_to_cron("twice a day  at nine"),
+    )
+    assert results == ["0 9 * * *", "0 9 * * *"]
+    ai_service._complete.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_ai_rejection_cache(ai_service):
+    """Verify phrases the model rejected are not sent again."""
+    ai_service._complete.side_effect = ValueError("ERROR: unclear")
+    for _ in range(2):
+        with pytest.raises(ValueError, match="unclear"):
+            await ai_service.parse_schedule_to_cron("whenever you like")
+    ai_service._complete.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_ai_persistent_cache(ai_service, temp_db):
+    """Verify parsed phrases survive a fresh service via the database."""
+    ai_service.db = temp_db
+    await ai_service.parse_schedule_to_cron("twice a day at nine")
+
+    ai_service._cache.clear()
+    ai_service._complete.reset_mock()
+    assert await ai_service.parse_schedule_to_cron("Twice a day at nine") == "0 9 * * *"
+    ai_service._complete.assert_not_awaited()
+
+
+def _groq_reply(mocker, content):
+    reply = mocker.Mock()
+    reply.choices = [mocker.Mock()]
+    reply.choices[0].message.content = content
+    return reply
+
+
+@pytest.fixture
+def groq_service(mocker):
+    """Create AIService whose Groq client answers every request with "0 9 * * *"."""
+    mocker.patch("groq.AsyncGroq")
+    service = AIService(api_key="test")
+    service.client.chat.completions.create = mocker.AsyncMock(return_value=_groq_reply(mocker, "0 9 * * *"))
+    return service
+
+
+@pytest.mark.asyncio
+async def test_ai_phrases_sent_separately(groq_service):
+    """Verify concurrent phrases never share a prompt."""
+    await asyncio.gather(
+        groq_service.parse_schedule_to_cron("breakfast time"),
+        groq_service.parse_schedule_to_cron("whenever"),
+    )
+
+    create = groq_service.client.chat.completions.create
+    prompts = [call.kwargs["messages"][1]["content"] for call in create.await_args_list]
+    assert sorted(prompts) == ['Text: "breakfast time"', 'Text: "whenever"']
+
+
+@pytest.mark.asyncio
+async def test_ai_empty_reply_fails_fast(groq_service, mocker):
+    """Verify a reply without text fails every caller instead of hanging them."""
+    groq_service.client.chat.completions.create.return_value = _groq_reply(mocker, None)
+
+    for _ in range(2):
+        results = await asyncio.wait_for(asyncio.gather(
+            groq_service.parse_schedule_to_cron("breakfast time"),
+            groq_service.parse_schedule_to_cron("whenever"),
+            return_exceptions=True,
+        ), timeout=1)
+        assert all(isinstance(r, RuntimeError) for r in results)
+    assert not groq_service._inflight
+
+
+@pytest.mark.asyncio
+async def test_ai_requests_run_concurrently(groq_service, mocker):
+    """Verify a new phrase does not wait for a Groq call already in flight."""
+    release = asyncio.Event()
+
+    async def create(**kwargs):
+        if "slow" in kwargs["messages"][1]["content"]:
+            await release.wait()
+        return _groq_reply(mocker, "0 9 * * *")
+
+    groq_service.client.chat.completions.create.side_effect = create
+    slow = asyncio.ensure_future(groq_service.parse_schedule_to_cron("slow phrase"))
+    await asyncio.sleep(0)
+    assert await asyncio.wait_for(groq_service.parse_schedule_to_cron("fast phrase"), timeout=1) == "0 9 * * *"
+    release.set()
+    assert await slow == "0 9 * * *"
+
+
+# --- Translation Smoke Tests ---
+
+def test_translation_bundle_smoke():
+    """Verify message bundles resolve keys, fall back, and are memoized."""
+    tr = TranslationService()
+    keys = ("msg_list_id", "no_such_key")
+
+    bundle = tr.get_messages(keys, "en")
+    assert bundle["msg_list_id"] == tr.get_message("msg_list_id", "en")
+    assert bundle["no_such_key"] == "no_such_key"
+    assert tr.get_messages(keys, "en") is bundle
+    assert tr.get_messages(keys, "xx") == tr.get_messages(keys, tr.default_lang)
+
+
+def test_describe_error_is_user_safe():
+    """Verify errors are shown as readable, translated text and never as class names."""
+    from src.bot.helpers import describe_error
+
+    tr = TranslationService()
+    assert describe_error(ValueError("Invalid cron format"), tr, "en") == "Invalid cron format"
+    assert describe_error(RuntimeError("Connection reset"), tr, "en") == tr.get_message("msg_error_ai_unavailable", "en")
+    assert describe_error(KeyError("x"), tr, "ru") == tr.get_message("msg_error_internal", "ru")
+
+
+@pytest.mark.asyncio
+async def test_validate_chat_id_cache(mocker):
+    """Verify reachable chats are remembered and unreachable ones re-checked."""
+    from src.bot.helpers import validate_chat_id
+
+    bot = mocker.Mock(id=4242)
+    bot.get_chat = mocker.AsyncMock()
+    assert await validate_chat_id(bot, "101") is True
+    assert await validate_chat_id(bot, "101") is True
+    bot.get_chat.assert_awaited_once()
+
+    bot.get_chat.side_effect = RuntimeError("chat not found")
+    assert await validate_chat_id(bot, "202") is False
+    assert await validate_chat_id(bot, "202") is False
+    assert bot.get_chat.await_count == 3
+
+
+# --- FSM Storage Smoke Tests ---
+
+@pytest.mark.asyncio
+async def test_bounded_storage_smoke():
+    """Verify FSM storage round-trips, evicts LRU entries, and drops cleared ones."""
+    from aiogram.fsm.storage.base import StorageKey
+    from src.bot.storage import BoundedMemoryStorage
+
+    storage = BoundedMemoryStorage(max_size=2)
+    keys = [StorageKey(bot_id=1, chat_id=i, user_id=i) for i in range(3)]
+
+    for key in keys:
+        await storage.set_state(key, "waiting")
+        await storage.set_data(key, {"n": key.user_id})
+
+    assert await storage.get_state(keys[0]) is None
+    assert await storage.get_data(keys[2]) == {"n": 2}
+
+    await storage.set_state(keys[2], None)
+    await storage.set_data(keys[2], {})
+    assert keys[2] not in storage._records
+
+
+def test_instance_lock_smoke(tmp_path):
+    """Verify only one holder of the scheduler lock at a time."""
+    from src.bot.instance_lock import InstanceLock
+
+    path = str(tmp_path / "scheduler.lock")
+    first, second = InstanceLock(path), InstanceLock(path)
+    assert first.acquire() is True
+    assert second.acquire() is False
+
+    first.release()
+    assert second.acquire() is True
+    second.release()
+
+
 # --- Bot Smoke Tests ---
 
 def test_bot_build_smoke(mocker):